@@ -0,0 +1,41 @@
+"""
+Input primitives driven through an OSBackend.
+One action = one complete event sequence (e.g. press + release).
+"""
+
+from dataclasses import dataclass
+
+from execution.backend_contract import OSBackend
+
+
+@dataclass
+class PointerMove:
+    backend: OSBackend
+    x: int
+    y: int
+    id: str = "body.pointer_move"
+
+    def run(self):
+        self.backend.move_pointer(self.x, self.y)
+
+
+@dataclass
+class Click:
+    backend: OSBackend
+    button: str = "left"
+    id: str = "body.click"
+
+    def run(self):
+        self.backend.mouse_button_down(self.button)
+        self.backend.mouse_button_up(self.button)
+
+
+@dataclass
+class KeyPress:
+    backend: OSBackend
+    key: str
+    id: str = "body.key_press"
+
+    def run(self):
+        self.backend.key_down(self.key)
+        self.backend.key_up(self.key)
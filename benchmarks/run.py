@@ -0,0 +1,185 @@
+"""
+Hot-path benchmarks: capture → delta → causality → log.
+
+  python -m benchmarks.run
+  python -m benchmarks.run --sizes 1080p,4k --patterns cursor,full --repeat 10 --out bench.json
+
+Headless: frames come from a SyntheticScreen; snapshots and logs go to a
+temporary directory. Output is one JSON document (per-stage timings in
+seconds) suitable for diffing between commits.
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic import SIZES, PATTERNS, SyntheticScreen
+from core.delta import Delta
+from core.logger import Logger, configure_event_log
+from evaluation.causality import evaluate_causality
+from execution.action_executor import ActionExecutor
+from execution.life_loop import LifeLoop, _compute_delta
+from perception import diff
+from perception.screen_adapter import HASH_ALGORITHMS, ScreenAdapter
+from perception.tiles import DEFAULT_TILE_SIZE
+
+
+STAGES = (
+    "capture", "capture_tiled", "capture_monitors",
+    "life_loop_delta", "life_loop_delta_pyramid", "life_loop_delta_tiled", "diff_compute_delta",
+    "causality", "logger_record", "experiment",
+) + tuple(f"hash_{name}" for name in HASH_ALGORITHMS)
+
+
+class _NoOp:
+    id = "benchmark.noop"
+
+    def run(self):
+        return None
+
+
+def _summary(samples):
+    arr = np.asarray(samples, dtype=np.float64)
+    return {
+        "n": int(arr.size),
+        "mean_s": float(arr.mean()),
+        "p50_s": float(np.percentile(arr, 50)),
+        "p90_s": float(np.percentile(arr, 90)),
+        "max_s": float(arr.max()),
+    }
+
+
+def _timed(samples, stage, fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    samples[stage].append(time.perf_counter() - t0)
+    return out
+
+
+def _clear(directory: Path):
+    for p in directory.glob("*"):
+        if p.is_file():
+            p.unlink()
+
+
+def bench_case(size: str, pattern: str, repeat: int, workdir: Path):
+    width, height, count = SIZES[size]
+    source = SyntheticScreen(width, height, count, pattern)
+
+    snap_dir = workdir / "snapshots"
+    adapter = ScreenAdapter(source=source, snapshot_dir=snap_dir)
+    # same source, snapshots carry tile digests (capture pays for them)
+    tiled = ScreenAdapter(source=source, snapshot_dir=snap_dir, tile_size=DEFAULT_TILE_SIZE)
+    logger = Logger(workdir / "experiments.jsonl")
+    loop = LifeLoop(ActionExecutor(), Logger(workdir / "loop.jsonl"), screen=adapter)
+
+    samples = {stage: [] for stage in STAGES}
+
+    for _ in range(repeat):
+        pre = _timed(samples, "capture", adapter.capture)
+        post = _timed(samples, "capture", adapter.capture)
+        _timed(samples, "capture_monitors", adapter.capture_monitors)
+        tiled_pre = _timed(samples, "capture_tiled", tiled.capture)
+        tiled_post = _timed(samples, "capture_tiled", tiled.capture)
+
+        delta = Delta(_timed(samples, "life_loop_delta", _compute_delta, pre, post)).to_dict()
+        _timed(samples, "life_loop_delta_pyramid", _compute_delta, pre, post, mode="pyramid")
+        _timed(samples, "life_loop_delta_tiled", _compute_delta, tiled_pre, tiled_post)
+        raw = post.frame.tobytes()
+        for name, fn in HASH_ALGORITHMS.items():
+            _timed(samples, f"hash_{name}", fn, raw)
+        _timed(samples, "diff_compute_delta", diff.compute_delta, pre.path, post.path, pre.width, pre.height)
+
+        causality = _timed(
+            samples, "causality", evaluate_causality,
+            delta, (pre.timestamp_monotonic, post.timestamp_monotonic),
+            pre.timestamp_monotonic, post.timestamp_monotonic,
+        )
+
+        record = {
+            "experiment_id": "benchmark",
+            "pre_snapshot": pre.to_dict(),
+            "post_snapshot": post.to_dict(),
+            "delta": delta,
+            "causality": causality,
+        }
+        _timed(samples, "logger_record", logger.record, record)
+
+        _timed(samples, "experiment", loop.run_experiment, _NoOp())
+
+        _clear(snap_dir)
+
+    return [
+        {"size": size, "pattern": pattern, "stage": stage, **_summary(values)}
+        for stage, values in samples.items()
+        if values
+    ]
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(SIZES))
+    parser.add_argument("--patterns", default=",".join(PATTERNS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in args.sizes.split(",") if s]
+    patterns = [p for p in args.patterns.split(",") if p]
+    for s in sizes:
+        if s not in SIZES:
+            parser.error(f"unknown size {s!r} (choose from {', '.join(SIZES)})")
+    for p in patterns:
+        if p not in PATTERNS:
+            parser.error(f"unknown pattern {p!r} (choose from {', '.join(PATTERNS)})")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="eme-bench-") as tmp:
+        workdir = Path(tmp)
+        configure_event_log(workdir / "events.log", buffered=True)
+
+        for size in sizes:
+            for pattern in patterns:
+                results.extend(bench_case(size, pattern, args.repeat, workdir))
+                print(f"done {size} {pattern}", file=sys.stderr)
+
+    document = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(document, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Synthetic frame source.
+
+mss-compatible (`monitors`, `grab(monitor)`) so ScreenAdapter can run
+headless. Each grab advances a deterministic change pattern.
+"""
+
+import numpy as np
+
+
+SIZES = {
+    "1080p": (1920, 1080, 1),
+    "4k": (3840, 2160, 1),
+    "3x4k": (3840, 2160, 3),
+}
+
+PATTERNS = ("static", "cursor", "window", "scatter", "full")
+
+
+class SyntheticScreen:
+    """
+    `count` monitors of width x height side by side, BGRA.
+
+    Patterns (per grab):
+      static   nothing changes
+      cursor   a 16x16 sprite moves a few pixels
+      window   a 400x300 rectangle is repainted
+      scatter  1000 isolated pixels change across the whole screen
+      full     every pixel changes
+    """
+
+    def __init__(self, width: int, height: int, count: int = 1, pattern: str = "static", seed: int = 0):
+        if pattern not in PATTERNS:
+            raise ValueError(f"pattern must be one of {PATTERNS}")
+
+        self.pattern = pattern
+        self._rng = np.random.default_rng(seed)
+        self._tick = 0
+
+        total_w = width * count
+        self.monitors = [{"left": 0, "top": 0, "width": total_w, "height": height}] + [
+            {"left": i * width, "top": 0, "width": width, "height": height}
+            for i in range(count)
+        ]
+
+        # desktop-like base: flat background with a gradient band
+        self._frame = np.full((height, total_w, 4), 40, dtype=np.uint8)
+        self._frame[..., 3] = 255
+        band = min(height, 64)
+        self._frame[:band, :, 1] = (np.arange(total_w) % 256).astype(np.uint8)
+
+    def grab(self, monitor: dict) -> np.ndarray:
+        self._advance()
+        top, left = monitor["top"], monitor["left"]
+        return self._frame[top:top + monitor["height"], left:left + monitor["width"]].copy()
+
+    def _advance(self) -> None:
+        self._tick += 1
+        f = self._frame
+        h, w = f.shape[:2]
+        t = self._tick
+
+        if self.pattern == "cursor":
+            x = (t * 7) % (w - 16)
+            y = (t * 3) % (h - 16)
+            f[y:y + 16, x:x + 16, :3] = 255 - f[y:y + 16, x:x + 16, :3]
+
+        elif self.pattern == "window":
+            x = min(w - 400, 100 + (t % 5) * 20)
+            y = min(h - 300, 100)
+            f[y:y + 300, x:x + 400, :3] = (t * 37) % 256
+
+        elif self.pattern == "scatter":
+            ys = self._rng.integers(0, h, 1000)
+            xs = self._rng.integers(0, w, 1000)
+            f[ys, xs, 0] ^= 0xFF
+
+        elif self.pattern == "full":
+            f[..., :3] += 1
@@ -1,5 +1,294 @@
+"""
+LINUX BACKEND — X11
+
+Persistent display connection. Frames via MIT-SHM into one reusable
+shared-memory image; input via XTest.
+
+Rules:
+- One connection and one SHM segment for the backend's lifetime
+- capture_screen returns a view of the shared buffer, valid until the
+  next capture or close() (metadata buffer_reused=True): keep a frame → copy it
+- Every input event is synced to the server and timestamped immediately
+  before and after injection (last_injection)
+- Missing library, extension or display → RuntimeError at construction
+
+Testable headless against Xvfb (DISPLAY=:99 Xvfb :99 -screen 0 1280x800x24).
+"""
+
+import os
+import time
+import ctypes
+import ctypes.util
+import threading
+from typing import Tuple, Any
+
+import numpy as np
+
 from execution.backend_contract import OSBackend
 
 
+_ZPIXMAP = 2
+_ALL_PLANES = (1 << (8 * ctypes.sizeof(ctypes.c_ulong))) - 1
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        ("f", ctypes.c_void_p * 6),
+    ]
+
+
+def _load(name: str):
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise RuntimeError(f"lib{name} not found")
+    return ctypes.CDLL(path)
+
+
+def _bind(lib, name, restype, *argtypes):
+    fn = getattr(lib, name)
+    fn.restype = restype
+    fn.argtypes = list(argtypes)
+    return fn
+
+
+class _Xlib:
+    """ctypes prototypes for the few calls used here."""
+
+    def __init__(self):
+        x11, xext, xtst = _load("X11"), _load("Xext"), _load("Xtst")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        vp, i, u, ul, s = ctypes.c_void_p, ctypes.c_int, ctypes.c_uint, ctypes.c_ulong, ctypes.c_char_p
+        img = ctypes.POINTER(_XImage)
+        shm = ctypes.POINTER(_XShmSegmentInfo)
+        ip = ctypes.POINTER(ctypes.c_int)
+
+        self.XOpenDisplay = _bind(x11, "XOpenDisplay", vp, s)
+        self.XCloseDisplay = _bind(x11, "XCloseDisplay", i, vp)
+        self.XDefaultScreen = _bind(x11, "XDefaultScreen", i, vp)
+        self.XRootWindow = _bind(x11, "XRootWindow", ul, vp, i)
+        self.XDefaultVisual = _bind(x11, "XDefaultVisual", vp, vp, i)
+        self.XDefaultDepth = _bind(x11, "XDefaultDepth", i, vp, i)
+        self.XDisplayWidth = _bind(x11, "XDisplayWidth", i, vp, i)
+        self.XDisplayHeight = _bind(x11, "XDisplayHeight", i, vp, i)
+        self.XSync = _bind(x11, "XSync", i, vp, i)
+        self.XDestroyImage = _bind(x11, "XDestroyImage", i, img)
+        self.XStringToKeysym = _bind(x11, "XStringToKeysym", ul, s)
+        self.XKeysymToKeycode = _bind(x11, "XKeysymToKeycode", ctypes.c_ubyte, vp, ul)
+
+        self.XShmQueryExtension = _bind(xext, "XShmQueryExtension", i, vp)
+        self.XShmCreateImage = _bind(xext, "XShmCreateImage", img, vp, vp, u, i, vp, shm, u, u)
+        self.XShmAttach = _bind(xext, "XShmAttach", i, vp, shm)
+        self.XShmDetach = _bind(xext, "XShmDetach", i, vp, shm)
+        self.XShmGetImage = _bind(xext, "XShmGetImage", i, vp, ul, img, i, i, ul)
+
+        self.XTestQueryExtension = _bind(xtst, "XTestQueryExtension", i, vp, ip, ip, ip, ip)
+        self.XTestFakeMotionEvent = _bind(xtst, "XTestFakeMotionEvent", i, vp, i, i, i, ul)
+        self.XTestFakeButtonEvent = _bind(xtst, "XTestFakeButtonEvent", i, vp, u, i, ul)
+        self.XTestFakeKeyEvent = _bind(xtst, "XTestFakeKeyEvent", i, vp, u, i, ul)
+
+        self.shmget = _bind(libc, "shmget", i, i, ctypes.c_size_t, i)
+        self.shmat = _bind(libc, "shmat", vp, i, vp, i)
+        self.shmdt = _bind(libc, "shmdt", i, vp)
+        self.shmctl = _bind(libc, "shmctl", i, i, i, vp)
+
+
 class LinuxBackend(OSBackend):
-    pass
+    """
+    display: X display name (default $DISPLAY).
+    """
+
+    def __init__(self, display: str = None):
+        self._x = _Xlib()
+        self._lock = threading.Lock()
+        self._frame_id = 0
+        self._keycodes = {}
+        self._image = None
+        self._shm = None
+        self._frame = None
+        self.last_injection = None
+
+        name = display if display is not None else os.environ.get("DISPLAY")
+        self._dpy = self._x.XOpenDisplay(name.encode() if name else None)
+        if not self._dpy:
+            raise RuntimeError(f"Cannot open X display {name!r}")
+
+        try:
+            self._setup()
+        except Exception:
+            self.close()
+            raise
+
+    def _setup(self) -> None:
+        x, dpy = self._x, self._dpy
+
+        if not x.XShmQueryExtension(dpy):
+            raise RuntimeError("X server lacks MIT-SHM")
+        dummy = ctypes.c_int()
+        if not x.XTestQueryExtension(dpy, *(ctypes.byref(dummy) for _ in range(4))):
+            raise RuntimeError("X server lacks XTEST")
+
+        screen = x.XDefaultScreen(dpy)
+        self._root = x.XRootWindow(dpy, screen)
+        self.width = x.XDisplayWidth(dpy, screen)
+        self.height = x.XDisplayHeight(dpy, screen)
+
+        shm = _XShmSegmentInfo()
+        image = x.XShmCreateImage(
+            dpy, x.XDefaultVisual(dpy, screen), x.XDefaultDepth(dpy, screen),
+            _ZPIXMAP, None, ctypes.byref(shm), self.width, self.height,
+        )
+        if not image:
+            raise RuntimeError("XShmCreateImage failed")
+        self._image = image
+
+        img = image.contents
+        if img.bits_per_pixel != 32:
+            raise RuntimeError(f"Unsupported pixel format: {img.bits_per_pixel} bpp (need 32)")
+
+        size = img.bytes_per_line * img.height
+        shm.shmid = x.shmget(_IPC_PRIVATE, size, _IPC_CREAT | 0o600)
+        if shm.shmid < 0:
+            raise RuntimeError(f"shmget failed: errno {ctypes.get_errno()}")
+
+        addr = x.shmat(shm.shmid, None, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            x.shmctl(shm.shmid, _IPC_RMID, None)
+            raise RuntimeError(f"shmat failed: errno {ctypes.get_errno()}")
+        shm.shmaddr = addr
+        shm.readOnly = 0
+        img.data = addr
+
+        attached = x.XShmAttach(dpy, ctypes.byref(shm))
+        x.XSync(dpy, 0)
+        # segment disappears once both sides detach, even after a crash
+        x.shmctl(shm.shmid, _IPC_RMID, None)
+        if not attached:
+            x.shmdt(addr)
+            raise RuntimeError("XShmAttach failed")
+        self._shm = shm
+
+        raw = np.ctypeslib.as_array(ctypes.cast(addr, ctypes.POINTER(ctypes.c_uint8)), shape=(size,))
+        rows = raw.reshape((img.height, img.bytes_per_line // 4, 4))
+        self._frame = rows[:, :self.width]
+        self._frame.flags.writeable = False
+
+    # ---- OSBackend ----
+
+    def move_pointer(self, x: int, y: int) -> None:
+        self._inject(self._x.XTestFakeMotionEvent, -1, int(x), int(y), 0)
+
+    def mouse_button_down(self, button: str) -> None:
+        self._inject(self._x.XTestFakeButtonEvent, self._button(button), 1, 0)
+
+    def mouse_button_up(self, button: str) -> None:
+        self._inject(self._x.XTestFakeButtonEvent, self._button(button), 0, 0)
+
+    def key_down(self, key: str) -> None:
+        self._inject(self._x.XTestFakeKeyEvent, self._keycode(key), 1, 0)
+
+    def key_up(self, key: str) -> None:
+        self._inject(self._x.XTestFakeKeyEvent, self._keycode(key), 0, 0)
+
+    def capture_screen(self) -> Tuple[Any, float, dict]:
+        with self._lock:
+            if not self._x.XShmGetImage(self._dpy, self._root, self._image, 0, 0, _ALL_PLANES):
+                raise RuntimeError("XShmGetImage failed")
+            ts = time.perf_counter()
+            self._frame_id += 1
+            meta = {
+                "left": 0,
+                "top": 0,
+                "width": self.width,
+                "height": self.height,
+                "frame_id": self._frame_id,
+                "buffer_reused": True,
+            }
+        return self._frame, ts, meta
+
+    def close(self) -> None:
+        with self._lock:
+            x = self._x
+            if self._shm is not None:
+                x.XShmDetach(self._dpy, ctypes.byref(self._shm))
+                x.XSync(self._dpy, 0)
+                x.shmdt(self._shm.shmaddr)
+                self._shm = None
+            if self._image is not None:
+                # the image's data lives in the (now detached) segment, not the heap
+                self._image.contents.data = None
+                x.XDestroyImage(self._image)
+                self._image = None
+            if self._dpy:
+                x.XCloseDisplay(self._dpy)
+                self._dpy = None
+            self._frame = None
+
+    # ---- input ----
+
+    def _inject(self, fn, *args) -> None:
+        with self._lock:
+            t_before = time.perf_counter()
+            ok = fn(self._dpy, *args)
+            # round trip: the server has processed the event when XSync returns
+            self._x.XSync(self._dpy, 0)
+            t_after = time.perf_counter()
+            self.last_injection = (t_before, t_after)
+        if not ok:
+            raise RuntimeError(f"{fn.__name__} rejected by the X server")
+
+    def _button(self, button: str) -> int:
+        try:
+            return BUTTONS[button]
+        except KeyError:
+            raise RuntimeError(f"Unknown button: {button!r}")
+
+    def _keycode(self, key: str) -> int:
+        code = self._keycodes.get(key)
+        if code is None:
+            keysym = self._x.XStringToKeysym(key.encode())
+            code = self._x.XKeysymToKeycode(self._dpy, keysym) if keysym else 0
+            if not code:
+                raise RuntimeError(f"No keycode for key {key!r}")
+            self._keycodes[key] = code
+        return code
+
+
+# Optional manual check (e.g. under Xvfb)
+if __name__ == "__main__":
+    backend = LinuxBackend()
+    backend.move_pointer(10, 10)
+    t_in = backend.last_injection
+    frame, ts, meta = backend.capture_screen()
+    print(meta, f"inject {1e3 * (t_in[1] - t_in[0]):.3f} ms", f"inject→capture {1e3 * (ts - t_in[1]):.3f} ms")
+    backend.close()
@@ -0,0 +1,236 @@
+"""
+VIRTUAL BACKEND — IN-MEMORY BODY
+
+OSBackend over a NumPy BGRA framebuffer. No display server.
+
+Every input event renders a deterministic change:
+- move_pointer     cursor sprite moves (pixels under it restored exactly)
+- button down      focuses the window cell under the pointer (focus rectangle)
+- key down         draws the key's glyph at the focused cell's caret
+- button/key up    no visible change
+
+Rules:
+- Same event sequence → same frames, bit for bit
+- capture_screen returns the live framebuffer read-only, without a copy;
+  the next event copies it first (copy-on-write), so a captured frame
+  never changes
+"""
+
+import time
+import hashlib
+import threading
+from typing import Tuple, Any
+
+import numpy as np
+
+from execution.backend_contract import OSBackend
+
+
+CELL_W, CELL_H = 320, 200
+GLYPH_W, GLYPH_H = 8, 12
+INSET = 6
+
+BACKGROUND = (48, 40, 32, 255)   # BGRA
+CELL_FILL = (64, 56, 48, 255)
+FOCUS = (0, 160, 255, 255)
+INK = (230, 230, 230, 255)
+
+
+# X outline, o fill, . transparent
+_CURSOR = (
+    "X...........",
+    "XX..........",
+    "XoX.........",
+    "XooX........",
+    "XoooX.......",
+    "XooooX......",
+    "XoooooX.....",
+    "XooooooX....",
+    "XoooooooX...",
+    "XooooooooX..",
+    "XoooooooooX.",
+    "XooooooXXXXX",
+    "XoooXooX....",
+    "XooXXooX....",
+    "XoX..XooX...",
+    "XX...XooX...",
+    "X.....XooX..",
+    "......XooX..",
+    ".......XX...",
+)
+
+
+def _cursor_sprite():
+    """(mask, BGRA pixels) of the arrow cursor."""
+    art = np.array([list(row) for row in _CURSOR])
+    mask = art != "."
+    pixels = np.zeros(art.shape + (4,), dtype=np.uint8)
+    pixels[art == "X"] = (0, 0, 0, 255)
+    pixels[art == "o"] = (255, 255, 255, 255)
+    return mask, pixels
+
+
+_CURSOR_MASK, _CURSOR_PIXELS = _cursor_sprite()
+
+
+def _glyph(key: str) -> np.ndarray:
+    """GLYPH_H x GLYPH_W boolean pattern derived from the key name."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=GLYPH_W * GLYPH_H // 8).digest()
+    bits = np.unpackbits(np.frombuffer(digest, dtype=np.uint8))
+    return bits.reshape((GLYPH_H, GLYPH_W)).astype(bool)
+
+
+class VirtualBackend(OSBackend):
+    """
+    width x height virtual screen divided into CELL_W x CELL_H window cells.
+    """
+
+    def __init__(self, width: int = 1280, height: int = 800):
+        if width < CELL_W or height < CELL_H:
+            raise ValueError(f"screen must be at least {CELL_W}x{CELL_H}")
+
+        self.width = int(width)
+        self.height = int(height)
+
+        self._lock = threading.Lock()
+        self._fb = np.empty((self.height, self.width, 4), dtype=np.uint8)
+        self._shared = False
+        self._frame_id = 0
+
+        self._pointer = (self.width // 2, self.height // 2)
+        self._under = None
+        self._buttons = set()
+        self._keys = set()
+        self._focus = None
+        self._carets = {}
+        self._glyphs = {}
+
+        self._fb[:] = BACKGROUND
+        for cx in range(self.width // CELL_W):
+            for cy in range(self.height // CELL_H):
+                x, y = cx * CELL_W, cy * CELL_H
+                self._fb[y + 2:y + CELL_H - 2, x + 2:x + CELL_W - 2] = CELL_FILL
+        self._show_cursor()
+
+    # ---- OSBackend ----
+
+    def move_pointer(self, x: int, y: int) -> None:
+        x = min(max(int(x), 0), self.width - 1)
+        y = min(max(int(y), 0), self.height - 1)
+        with self._lock:
+            if (x, y) == self._pointer:
+                return
+            self._begin_write()
+            self._hide_cursor()
+            self._pointer = (x, y)
+            self._show_cursor()
+
+    def mouse_button_down(self, button: str) -> None:
+        with self._lock:
+            self._buttons.add(button)
+            cell = self._cell_at(*self._pointer)
+            if cell is None or cell == self._focus:
+                return
+            self._begin_write()
+            self._hide_cursor()
+            if self._focus is not None:
+                self._outline(self._focus, CELL_FILL)
+            self._focus = cell
+            self._outline(cell, FOCUS)
+            self._show_cursor()
+
+    def mouse_button_up(self, button: str) -> None:
+        with self._lock:
+            self._buttons.discard(button)
+
+    def key_down(self, key: str) -> None:
+        with self._lock:
+            self._keys.add(key)
+            self._begin_write()
+            self._hide_cursor()
+            self._type(key)
+            self._show_cursor()
+
+    def key_up(self, key: str) -> None:
+        with self._lock:
+            self._keys.discard(key)
+
+    def capture_screen(self) -> Tuple[Any, float, dict]:
+        with self._lock:
+            frame = self._fb.view()
+            frame.flags.writeable = False
+            self._shared = True
+            ts = time.perf_counter()
+            meta = {
+                "left": 0,
+                "top": 0,
+                "width": self.width,
+                "height": self.height,
+                "frame_id": self._frame_id,
+                "buffer_reused": False,
+            }
+        return frame, ts, meta
+
+    # ---- rendering ----
+
+    def _begin_write(self) -> None:
+        # a captured frame still references the buffer: detach first
+        if self._shared:
+            self._fb = self._fb.copy()
+            self._shared = False
+        self._frame_id += 1
+
+    def _cursor_box(self):
+        x, y = self._pointer
+        h, w = _CURSOR_MASK.shape
+        return x, y, min(w, self.width - x), min(h, self.height - y)
+
+    def _show_cursor(self) -> None:
+        x, y, w, h = self._cursor_box()
+        area = self._fb[y:y + h, x:x + w]
+        self._under = area.copy()
+        mask = _CURSOR_MASK[:h, :w]
+        area[mask] = _CURSOR_PIXELS[:h, :w][mask]
+
+    def _hide_cursor(self) -> None:
+        x, y, w, h = self._cursor_box()
+        self._fb[y:y + h, x:x + w] = self._under
+
+    def _cell_at(self, x: int, y: int):
+        cell = (x // CELL_W, y // CELL_H)
+        if cell[0] >= self.width // CELL_W or cell[1] >= self.height // CELL_H:
+            return None
+        return cell
+
+    def _outline(self, cell, color) -> None:
+        x, y = cell[0] * CELL_W + 2, cell[1] * CELL_H + 2
+        w, h = CELL_W - 4, CELL_H - 4
+        fb = self._fb
+        fb[y:y + 2, x:x + w] = color
+        fb[y + h - 2:y + h, x:x + w] = color
+        fb[y:y + h, x:x + 2] = color
+        fb[y:y + h, x + w - 2:x + w] = color
+
+    def _type(self, key: str) -> None:
+        cell = self._focus if self._focus is not None else (0, 0)
+        cols = (CELL_W - 2 * INSET) // (GLYPH_W + 1)
+        rows = (CELL_H - 2 * INSET) // (GLYPH_H + 1)
+
+        n = self._carets.get(cell, 0)
+        if n == cols * rows:
+            # cell full: clear the text area and start over
+            x0, y0 = cell[0] * CELL_W + INSET, cell[1] * CELL_H + INSET
+            self._fb[y0:y0 + rows * (GLYPH_H + 1), x0:x0 + cols * (GLYPH_W + 1)] = CELL_FILL
+            n = 0
+
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = self._glyphs[key] = _glyph(key)
+
+        x = cell[0] * CELL_W + INSET + (n % cols) * (GLYPH_W + 1)
+        y = cell[1] * CELL_H + INSET + (n // cols) * (GLYPH_H + 1)
+        area = self._fb[y:y + GLYPH_H, x:x + GLYPH_W]
+        area[...] = CELL_FILL
+        area[glyph] = INK
+
+        self._carets[cell] = n + 1
@@ -0,0 +1,231 @@
+"""
+Indexed experiment store.
+
+Same records as experiments.jsonl, kept in SQLite:
+- hot fields as indexed columns (action_id, wall time, causality reason)
+- the full record as JSON text, unchanged
+
+Filled live next to the JSONL log (Logger(tee=[store])) or by ingesting
+existing JSONL logs. Never the source of truth: JSONL stays append-only.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+from core.logger import LOG_DIR
+
+EXPERIMENT_DB = LOG_DIR / "experiments.sqlite"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    experiment_id   TEXT PRIMARY KEY,
+    action_id       TEXT,
+    wall_ts         REAL,
+    start_ts        REAL,
+    duration        REAL,
+    attributed      INTEGER,
+    reason          TEXT,
+    pixels_changed  INTEGER,
+    percent_changed REAL,
+    raw_error       TEXT,
+    record          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_experiments_action ON experiments (action_id, wall_ts);
+CREATE INDEX IF NOT EXISTS idx_experiments_wall ON experiments (wall_ts);
+CREATE INDEX IF NOT EXISTS idx_experiments_reason ON experiments (reason, wall_ts);
+"""
+
+_COLUMNS = (
+    "experiment_id", "action_id", "wall_ts", "start_ts", "duration",
+    "attributed", "reason", "pixels_changed", "percent_changed", "raw_error", "record",
+)
+
+
+def _wall_ts(record: Dict[str, Any]) -> Optional[float]:
+    """Wall-clock time of an experiment: post snapshot time, else the
+    millisecond prefix of a flat snapshot filename."""
+    for key in ("post_snapshot", "pre_snapshot"):
+        snap = record.get(key) or {}
+        if snap.get("timestamp_wall") is not None:
+            return float(snap["timestamp_wall"])
+
+        name = Path(str(snap.get("path") or "")).name
+        prefix = name.split("_", 1)[0]
+        if prefix.isdigit():
+            return int(prefix) / 1000.0
+
+    return None
+
+
+def _row(record: Dict[str, Any]):
+    delta = record.get("delta") or {}
+    causality = record.get("causality") or {}
+    attributed = causality.get("attributed")
+
+    return (
+        record.get("experiment_id"),
+        record.get("action_id"),
+        _wall_ts(record),
+        record.get("start_timestamp"),
+        record.get("duration"),
+        None if attributed is None else int(bool(attributed)),
+        causality.get("reason"),
+        delta.get("pixels_changed"),
+        delta.get("percent_changed"),
+        record.get("raw_error"),
+        json.dumps(record, ensure_ascii=False),
+    )
+
+
+class ExperimentStore:
+    """
+    SQLite experiment index. record() never raises (Logger contract).
+    """
+
+    def __init__(self, path: Path = EXPERIMENT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---- writes ----
+
+    def record(self, record: dict):
+        try:
+            self._insert([_row(record)])
+        except Exception:
+            pass
+
+    def ingest(self, records: Iterable[Dict[str, Any]], batch_size: int = 5000) -> int:
+        """Insert records (duplicates by experiment_id are skipped)."""
+        count = 0
+        batch = []
+        for record in records:
+            batch.append(_row(record))
+            if len(batch) >= batch_size:
+                count += self._insert(batch)
+                batch = []
+        if batch:
+            count += self._insert(batch)
+        return count
+
+    def ingest_jsonl(self, path: Path, batch_size: int = 5000) -> int:
+        return self.ingest(iter_jsonl(path), batch_size)
+
+    def _insert(self, rows) -> int:
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO experiments ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                rows,
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    # ---- reads ----
+
+    @staticmethod
+    def _where(action_id=None, since=None, until=None, reason=None, attributed=None):
+        clauses, params = [], []
+        if action_id is not None:
+            clauses.append("action_id = ?")
+            params.append(action_id)
+        if since is not None:
+            clauses.append("wall_ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("wall_ts < ?")
+            params.append(until)
+        if reason is not None:
+            clauses.append("reason = ?")
+            params.append(reason)
+        if attributed is not None:
+            clauses.append("attributed = ?")
+            params.append(int(bool(attributed)))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(self, limit: int = None, **filters) -> Iterator[Dict[str, Any]]:
+        """Stream full records matching the filters, oldest first."""
+        where, params = self._where(**filters)
+        sql = f"SELECT record FROM experiments {where} ORDER BY wall_ts"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            rows = cursor.fetchmany(1000)
+
+        while rows:
+            for (text,) in rows:
+                yield json.loads(text)
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+
+    def stats(self, percentiles=(0.5, 0.9, 0.99), **filters) -> Dict[str, Any]:
+        """Count, causality rate, reasons and duration percentiles (nearest rank)."""
+        where, params = self._where(**filters)
+
+        with self._lock:
+            total, attributed = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(attributed), 0) FROM experiments {where}", params
+            ).fetchone()
+
+            reasons = dict(self._conn.execute(
+                f"SELECT reason, COUNT(*) FROM experiments {where} GROUP BY reason ORDER BY 2 DESC", params
+            ).fetchall())
+
+            dur_where = f"{where} {'AND' if where else 'WHERE'} duration IS NOT NULL"
+            (n_dur,) = self._conn.execute(
+                f"SELECT COUNT(*) FROM experiments {dur_where}", params
+            ).fetchone()
+
+            durations = {}
+            for p in percentiles:
+                if n_dur == 0:
+                    durations[f"p{p * 100:g}"] = None
+                    continue
+                # nearest rank: the smallest value with at least p of the data at or below it
+                offset = min(n_dur - 1, max(0, math.ceil(p * n_dur - 1e-9) - 1))
+                (value,) = self._conn.execute(
+                    f"SELECT duration FROM experiments {dur_where} ORDER BY duration LIMIT 1 OFFSET ?",
+                    params + [offset],
+                ).fetchone()
+                durations[f"p{p * 100:g}"] = value
+
+        return {
+            "experiments": total,
+            "attributed": attributed,
+            "causality_rate": (attributed / total) if total else None,
+            "reasons": reasons,
+            "duration": durations,
+        }
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream records from a JSONL log, skipping unparseable lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -1,7 +1,15 @@
+import gzip
 import json
+import os
 import time
+import atexit
+import shutil
+import threading
+import weakref
 from pathlib import Path
 
+from core import metrics, tracing
+
 BASE = Path(__file__).resolve().parent.parent
 LOG_DIR = BASE / "logs"
 
@@ -17,32 +25,226 @@ def _ensure_dir(path: Path):
         pass
 
 
+# buffered sinks, so a crash or exit can flush them all (weak: a dropped
+# sink is not kept alive by this registry)
+_buffered_sinks = weakref.WeakSet()
+
+
+def _close_buffered_sinks():
+    for sink in list(_buffered_sinks):
+        sink.close()
+
+
+atexit.register(_close_buffered_sinks)
+
+
+class _LineSink:
+    """
+    Append-only line file. Never raises.
+
+    Unbuffered (default): open → append → close per line.
+    Buffered: persistent handle, lines batched in memory and flushed when
+    flush_lines / flush_bytes is reached, on flush(), or at exit; a line never
+    waits longer than flush_interval (a timer flushes an idle buffer).
+    With max_bytes, the file rotates to path.1 … path.<backups>
+    (gzip-compressed as path.N.gz when compress=True).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        buffered: bool = False,
+        flush_lines: int = 256,
+        flush_bytes: int = 1 << 20,
+        flush_interval: float = 1.0,
+        max_bytes: int = None,
+        backups: int = 5,
+        compress: bool = False,
+    ):
+        self.path = Path(path)
+        self._buffered = buffered
+        self._flush_lines = flush_lines
+        self._flush_bytes = flush_bytes
+        self._flush_interval = flush_interval
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._compress = compress
+
+        self._lock = threading.Lock()
+        self._handle = None
+        self._pending = []
+        self._pending_bytes = 0
+        self._timer = None
+
+        _ensure_dir(self.path)
+
+        if buffered:
+            _buffered_sinks.add(self)
+
+    def write(self, line: str):
+        try:
+            with self._lock:
+                if not self._buffered:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(line + "\n")
+                        size = f.tell()
+                    self._maybe_rotate(size)
+                    return
+
+                self._pending.append(line + "\n")
+                self._pending_bytes += len(line) + 1
+
+                if len(self._pending) >= self._flush_lines or self._pending_bytes >= self._flush_bytes:
+                    self._flush_locked()
+                elif self._timer is None:
+                    # time bound for this line (and any that join it)
+                    self._timer = threading.Timer(self._flush_interval, self._on_timer)
+                    self._timer.daemon = True
+                    self._timer.start()
+        except Exception:
+            pass
+
+    def flush(self):
+        try:
+            with self._lock:
+                self._flush_locked()
+        except Exception:
+            pass
+
+    def _on_timer(self):
+        try:
+            with self._lock:
+                self._timer = None
+                self._flush_locked()
+        except Exception:
+            pass
+
+    def close(self):
+        try:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                self._flush_locked()
+                if self._handle is not None:
+                    self._handle.close()
+                    self._handle = None
+        except Exception:
+            pass
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+
+        lines = self._pending
+        self._pending = []
+        self._pending_bytes = 0
+
+        if self._handle is None:
+            _ensure_dir(self.path)
+            self._handle = open(self.path, "a", encoding="utf-8")
+
+        self._handle.write("".join(lines))
+        self._handle.flush()
+        self._maybe_rotate(self._handle.tell())
+
+    def _maybe_rotate(self, size: int):
+        if self._max_bytes is None or size < self._max_bytes:
+            return
+
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+        suffix = ".gz" if self._compress else ""
+
+        def segment(i):
+            return self.path.with_name(f"{self.path.name}.{i}{suffix}")
+
+        oldest = segment(self._backups)
+        if oldest.exists():
+            oldest.unlink()
+        for i in range(self._backups - 1, 0, -1):
+            if segment(i).exists():
+                segment(i).replace(segment(i + 1))
+
+        if self._backups < 1:
+            self.path.unlink()
+        elif self._compress:
+            with open(self.path, "rb") as src, gzip.open(segment(1), "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.unlink(self.path)
+        else:
+            self.path.replace(segment(1))
+
+
 class Logger:
-    def __init__(self, path: Path = EXPERIMENT_LOG):
+    """
+    Experiment record sink (JSON lines).
+    Buffering / rotation options are passed through to the line sink.
+    tee: further record() sinks (e.g. an ExperimentStore) fed every record
+    after its JSONL line; they must not raise, and are not closed here.
+    """
+
+    def __init__(self, path: Path = EXPERIMENT_LOG, tee=(), **sink_options):
         self.path = path
-        _ensure_dir(self.path)
+        self._sink = _LineSink(path, **sink_options)
+        self._tee = tuple(tee)
 
     def record(self, record: dict):
         try:
-            line = json.dumps(record, ensure_ascii=False)
-            with open(self.path, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
+            with tracing.span("log.serialize"):
+                line = json.dumps(record, ensure_ascii=False)
+            with tracing.span("log.write"):
+                self._sink.write(line)
+            metrics.LOG_RECORDS.inc()
+            metrics.LOG_BYTES.inc(len(line) + 1)
         except Exception:
-            pass
+            metrics.LOG_FAILURES.inc()
+
+        for sink in self._tee:
+            try:
+                sink.record(record)
+            except Exception:
+                pass
+
+    def flush(self):
+        """Barrier: buffered records are on disk when this returns."""
+        self._sink.flush()
+
+    def close(self):
+        self._sink.close()
+
+
+_event_sink = _LineSink(EVENT_LOG)
+
+
+def configure_event_log(path: Path = EVENT_LOG, **sink_options):
+    """Switch events.log to buffered / rotating mode (same options as _LineSink)."""
+    global _event_sink
+    previous = _event_sink
+    _event_sink = _LineSink(path, **sink_options)
+    previous.close()
+
+
+def flush_events():
+    _event_sink.flush()
 
 
 def log_event(message: str):
     try:
-        _ensure_dir(EVENT_LOG)
         ts = time.time()
-        with open(EVENT_LOG, "a", encoding="utf-8") as f:
-            f.write(f"{ts} | {message}\n")
+        _event_sink.write(f"{ts} | {message}")
     except Exception:
         pass
 
 
 def log_crash(message: str):
     try:
+        # events and records leading up to a crash must not stay in memory
+        _event_sink.flush()
+        for sink in list(_buffered_sinks):
+            sink.flush()
         _ensure_dir(CRASH_LOG)
         with open(CRASH_LOG, "a", encoding="utf-8") as f:
             f.write(message + "\n")
@@ -0,0 +1,240 @@
+"""
+METRICS
+
+In-process counters and histograms, exported as a Prometheus textfile
+(node_exporter textfile collector).
+
+Rules:
+- Updates are one uncontended lock + an add; no I/O on the hot path
+- Only the exporter thread formats or writes anything
+- The textfile is replaced atomically; a scrape never sees a partial file
+- Metrics never raise into the code they measure
+"""
+
+import os
+import bisect
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = tuple(1 << s for s in range(16, 30, 2))  # 64 KiB … 256 MiB
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Counter:
+    """
+    Monotonic counter, optionally labelled:
+      c.inc()                      (no labelnames)
+      c.labels("no_delta").inc()   (labelnames=("reason",))
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], _CounterChild] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = _CounterChild()
+
+    def labels(self, *values) -> _CounterChild:
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, _CounterChild())
+        return child
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield self.name, tuple(zip(self.labelnames, key)), child.value
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram (unlabelled). observe(v) is a bisect and an add.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)  # last slot: +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+
+    def samples(self):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative = 0
+        for bound, n in zip(self._bounds, counts):
+            cumulative += n
+            yield f"{self.name}_bucket", (("le", _format_value(bound)),), cumulative
+        cumulative += counts[-1]
+        yield f"{self.name}_bucket", (("le", "+Inf"),), cumulative
+        yield f"{self.name}_sum", (), total
+        yield f"{self.name}_count", (), cumulative
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(name, lambda: Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, documentation, buckets))
+
+    def _register(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path, registry: "Registry" = None) -> None:
+    """Atomically replace `path` with the registry's current state."""
+    registry = registry if registry is not None else REGISTRY
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(registry.render())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class TextfileExporter:
+    """
+    Background thread rewriting `path` every `interval` seconds
+    (and once more on stop()). Write failures are ignored; the next
+    interval retries.
+    """
+
+    def __init__(self, path: Path, interval: float = 15.0, registry: "Registry" = None):
+        self.path = Path(path)
+        self._interval = interval
+        self._registry = registry if registry is not None else REGISTRY
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._export()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._export()
+
+    def _export(self) -> None:
+        try:
+            write_textfile(self.path, self._registry)
+        except Exception:
+            pass
+
+
+REGISTRY = Registry()
+
+
+# ---- metrics fed by the pipeline ----
+
+EXPERIMENTS = REGISTRY.counter(
+    "eme_experiments_total", "Experiments recorded, by action outcome", ("outcome",))
+CAUSALITY = REGISTRY.counter(
+    "eme_causality_total", "Causality verdicts, by reason", ("reason",))
+CAPTURE_FAILURES = REGISTRY.counter(
+    "eme_capture_failures_total", "Captures that raised")
+CHECKSUM_MISMATCHES = REGISTRY.counter(
+    "eme_checksum_mismatches_total", "Persisted frames whose re-hash did not match")
+LOG_RECORDS = REGISTRY.counter(
+    "eme_log_records_total", "Experiment records written")
+LOG_FAILURES = REGISTRY.counter(
+    "eme_log_failures_total", "Experiment records dropped by the logger")
+LOG_BYTES = REGISTRY.counter(
+    "eme_log_bytes_total", "Serialized experiment record bytes")
+
+CAPTURE_SECONDS = REGISTRY.histogram(
+    "eme_capture_seconds", "Capture latency: grab through persisted snapshot")
+PERSIST_SECONDS = REGISTRY.histogram(
+    "eme_persist_seconds", "Snapshot persistence latency (one inline write or one writer batch)")
+DELTA_SECONDS = REGISTRY.histogram(
+    "eme_delta_seconds", "Pixel delta latency")
+DELTA_CACHE = REGISTRY.counter(
+    "eme_delta_cache_total", "Delta cache lookups, by result", ("result",))
+BYTES_WRITTEN = REGISTRY.histogram(
+    "eme_snapshot_bytes", "Bytes written per persisted frame", BYTES_BUCKETS)
@@ -0,0 +1,195 @@
+"""
+SPAN TRACING
+
+Timed spans around hot-path phases (capture, hash, write, verify, delta,
+causality, log).
+
+Rules:
+- Off by default; disabled spans are one shared no-op object
+- A span never raises into the code it measures
+- Durations are perf_counter seconds, summed per name into the phases
+  dict bound to the current thread (see collect); work fanned out with
+  pool_map adds to the caller's phases (summed over jobs, so a phase
+  may exceed wall time)
+- Optionally every span is streamed to a Chrome trace-event JSON file
+  (open in Perfetto / chrome://tracing)
+"""
+
+import os
+import json
+import threading
+import time
+from pathlib import Path
+
+from core import logger as _logger
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_t0")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self._tracer = tracer
+        self._name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._tracer._finish(self._name, self._t0, time.perf_counter() - self._t0)
+        return False
+
+
+class _Collect:
+    __slots__ = ("_local", "_phases", "_previous")
+
+    def __init__(self, local, phases: dict):
+        self._local = local
+        self._phases = phases
+
+    def __enter__(self):
+        self._previous = getattr(self._local, "phases", None)
+        self._local.phases = self._phases
+        return self._phases
+
+    def __exit__(self, *exc):
+        self._local.phases = self._previous
+        return False
+
+
+class Tracer:
+    """
+    trace_path: optional Chrome trace-event file (JSON array, appended;
+    buffered, flushed on flush()/close() and at exit).
+    """
+
+    def __init__(self, trace_path: Path = None):
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._sink = None
+        self._named_threads = set()
+
+        if trace_path is not None:
+            trace_path = Path(trace_path)
+            fresh = not trace_path.exists() or trace_path.stat().st_size == 0
+            self._sink = _logger._LineSink(trace_path, buffered=True)
+            if fresh:
+                # the trace format tolerates a missing closing bracket
+                self._sink.write("[")
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def collect(self, phases: dict) -> _Collect:
+        return _Collect(self._local, phases)
+
+    def flush(self) -> None:
+        if self._sink is not None:
+            self._sink.flush()
+
+    def close(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+
+    def _finish(self, name: str, t0: float, dur: float) -> None:
+        try:
+            phases = getattr(self._local, "phases", None)
+            if phases is not None:
+                phases[name] = phases.get(name, 0.0) + dur
+
+            if self._sink is not None:
+                tid = threading.get_ident()
+                if tid not in self._named_threads:
+                    self._named_threads.add(tid)
+                    self._emit({
+                        "name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                        "args": {"name": threading.current_thread().name},
+                    })
+                self._emit({
+                    "name": name, "ph": "X", "pid": self._pid, "tid": tid,
+                    "ts": t0 * 1e6, "dur": dur * 1e6,
+                })
+        except Exception:
+            pass
+
+    def _emit(self, event: dict) -> None:
+        self._sink.write(json.dumps(event) + ",")
+
+
+_tracer = None
+
+
+def configure_tracing(enabled: bool = True, trace_path: Path = None) -> None:
+    """Enable (optionally with a trace file) or disable process-wide tracing."""
+    global _tracer
+    previous = _tracer
+    _tracer = Tracer(trace_path) if enabled else None
+    if previous is not None:
+        previous.close()
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str):
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name)
+
+
+def collect(phases: dict):
+    """Bind `phases` to this thread: spans ending inside add their durations to it."""
+    tracer = _tracer
+    if tracer is None or phases is None:
+        return _NO_SPAN
+    return tracer.collect(phases)
+
+
+def pool_map(pool, fn, items) -> list:
+    """
+    list(pool.map(fn, items)), with spans inside the jobs added to the
+    phases bound to the calling thread (each job collects into its own
+    dict; merged here).
+    """
+    tracer = _tracer
+    phases = getattr(tracer._local, "phases", None) if tracer is not None else None
+    if phases is None:
+        return list(pool.map(fn, items))
+
+    def job(item):
+        part = {}
+        with tracer.collect(part):
+            return fn(item), part
+
+    results = []
+    for result, part in pool.map(job, items):
+        for name, dur in part.items():
+            phases[name] = phases.get(name, 0.0) + dur
+        results.append(result)
+    return results
+
+
+def new_phases():
+    """A fresh phases dict when tracing is enabled, else None."""
+    return {} if _tracer is not None else None
+
+
+def flush_trace() -> None:
+    tracer = _tracer
+    if tracer is not None:
+        tracer.flush()
@@ -0,0 +1,261 @@
+"""
+Batch causality re-evaluation.
+
+Same rules as evaluation.causality.evaluate_causality, applied to
+NumPy columns built from logged records, so thresholds can be re-scored
+over an entire history without re-running experiments.
+
+Rules:
+- Verdicts are identical to the scalar function's, record for record
+  (including its evaluator-failure cases)
+- Logged records are only read, never rewritten
+
+  python -m evaluation.batch_causality logs/experiments.jsonl --threshold 0.25 --compare 0.4
+"""
+
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+
+
+# reason code → reason string (codes are stable; append only)
+REASONS = (
+    "no_delta",
+    "no_observable_change",
+    "change_precedes_action",
+    "change_outside_window",
+    "excessive_change_outlier",
+    "plausible_within_window",
+    "causality_evaluator_failure",
+)
+_CODE = {reason: i for i, reason in enumerate(REASONS)}
+_UNKNOWN = -1
+
+_FLOAT_COLUMNS = ("window_pct", "outlier_pct", "start", "end", "pre_ts", "post_ts")
+_BOOL_COLUMNS = ("has_delta", "delta_bad", "no_change", "window_bad", "outlier_bad")
+_NAMES = ("experiment_id",) + _BOOL_COLUMNS + _FLOAT_COLUMNS + ("logged",)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float))
+
+
+def _time(value) -> float:
+    return float(value) if _is_number(value) else np.nan
+
+
+def _delta_fields(delta):
+    """
+    (delta_bad, no_change, window_pct, window_bad, outlier_pct, outlier_bad):
+    the values the scalar rules compare, and whether comparing them raises.
+    """
+    if not hasattr(delta, "get"):
+        return True, False, 0.0, False, 0.0, False
+
+    no_change = delta.get("pixels_changed") in (0, None)
+
+    # change_outside_window: delta.get("percent_changed", 0) > 0
+    window = delta.get("percent_changed", 0)
+    window_bad = not _is_number(window)
+
+    # outlier: largest region's percent_changed, else the frame's
+    outlier, outlier_bad = 0.0, False
+    try:
+        value = delta.get("percent_changed") or 0.0
+        regions = delta.get("regions")
+        if regions:
+            value = max(r.get("percent_changed") or 0.0 for r in regions)
+        if _is_number(value):
+            outlier = float(value)
+        else:
+            outlier_bad = True
+    except Exception:
+        outlier_bad = True
+
+    return False, no_change, float(window) if not window_bad else 0.0, window_bad, outlier, outlier_bad
+
+
+def _row(record: Dict[str, Any]):
+    delta = record.get("delta")
+    pre = record.get("pre_snapshot") or {}
+    post = record.get("post_snapshot") or {}
+    logged = (record.get("causality") or {}).get("reason")
+
+    if delta is None:
+        fields = (False, False, 0.0, False, 0.0, False)
+    else:
+        fields = _delta_fields(delta)
+    delta_bad, no_change, window_pct, window_bad, outlier_pct, outlier_bad = fields
+
+    return (
+        record.get("experiment_id"),
+        delta is not None,
+        delta_bad,
+        no_change,
+        window_bad,
+        outlier_bad,
+        window_pct,
+        outlier_pct,
+        _time(record.get("start_timestamp")),
+        _time(record.get("end_timestamp")),
+        _time(pre.get("timestamp")),
+        _time(post.get("timestamp")),
+        _CODE.get(logged, _UNKNOWN),
+    )
+
+
+def load_columns(records: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """One pass over records → dict of equal-length columns."""
+    rows = [_row(r) for r in records]
+
+    if not rows:
+        cols = {name: np.zeros(0) for name in _NAMES}
+    else:
+        cols = {name: np.asarray(values) for name, values in zip(_NAMES, zip(*rows))}
+
+    for name in _BOOL_COLUMNS:
+        cols[name] = cols[name].astype(bool)
+    for name in _FLOAT_COLUMNS:
+        cols[name] = cols[name].astype(np.float64)
+    cols["logged"] = cols["logged"].astype(np.int8)
+    cols["experiment_id"] = cols["experiment_id"].astype(object)
+    return cols
+
+
+def load_jsonl(path: Path) -> Dict[str, np.ndarray]:
+    def records():
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    return load_columns(records())
+
+
+def save_columns(cols: Dict[str, np.ndarray], path: Path) -> None:
+    """Cache columns (.npz) so repeated re-scoring skips JSON parsing."""
+    np.savez(path, **{k: (v.astype(str) if k == "experiment_id" else v) for k, v in cols.items()})
+
+
+def open_columns(path: Path) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        cols = {k: data[k] for k in data.files}
+    cols["experiment_id"] = cols["experiment_id"].astype(object)
+    return cols
+
+
+def evaluate(cols: Dict[str, np.ndarray], max_expected_change: float = 0.25) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (attributed bool array, reason code int8 array); REASONS maps codes.
+    Rule order and edge cases follow evaluate_causality exactly.
+    """
+    start, end = cols["start"], cols["end"]
+    pre_ts, post_ts = cols["pre_ts"], cols["post_ts"]
+
+    # a comparison against a missing timestamp raises in the scalar rules
+    precedes_bad = np.isnan(post_ts) | np.isnan(start)
+    outside_bad = np.isnan(pre_ts) | np.isnan(end)
+
+    with np.errstate(invalid="ignore"):
+        precedes = post_ts < start
+        late = pre_ts > end
+
+    conditions = [
+        ~cols["has_delta"],
+        cols["delta_bad"],
+        cols["no_change"],
+        precedes_bad,
+        precedes,
+        outside_bad | (late & cols["window_bad"]),
+        late & (cols["window_pct"] > 0),
+        cols["outlier_bad"],
+        cols["outlier_pct"] > max_expected_change,
+    ]
+    choices = [
+        _CODE["no_delta"],
+        _CODE["causality_evaluator_failure"],
+        _CODE["no_observable_change"],
+        _CODE["causality_evaluator_failure"],
+        _CODE["change_precedes_action"],
+        _CODE["causality_evaluator_failure"],
+        _CODE["change_outside_window"],
+        _CODE["causality_evaluator_failure"],
+        _CODE["excessive_change_outlier"],
+    ]
+    codes = np.select(conditions, choices, default=_CODE["plausible_within_window"]).astype(np.int8)
+    return codes == _CODE["plausible_within_window"], codes
+
+
+def reason_counts(codes: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(codes[codes >= 0], minlength=len(REASONS))
+    return {reason: int(n) for reason, n in zip(REASONS, counts) if n}
+
+
+def compare(cols: Dict[str, np.ndarray], config_a: Dict[str, Any], config_b: Dict[str, Any],
+            examples: int = 10) -> Dict[str, Any]:
+    """
+    Verdicts under two configurations (evaluate() keyword arguments) and
+    the transitions between them.
+    """
+    _, a = evaluate(cols, **config_a)
+    _, b = evaluate(cols, **config_b)
+
+    changed = a != b
+    pairs = a[changed].astype(np.int64) * len(REASONS) + b[changed]
+    transitions = {}
+    for pair, n in zip(*np.unique(pairs, return_counts=True)):
+        transitions[f"{REASONS[pair // len(REASONS)]} -> {REASONS[pair % len(REASONS)]}"] = int(n)
+
+    return {
+        "records": int(a.size),
+        "a": {"config": config_a, "reasons": reason_counts(a)},
+        "b": {"config": config_b, "reasons": reason_counts(b)},
+        "changed": int(changed.sum()),
+        "transitions": transitions,
+        "examples": [str(x) for x in cols["experiment_id"][changed][:examples]],
+    }
+
+
+def agreement(cols: Dict[str, np.ndarray], codes: np.ndarray) -> Dict[str, int]:
+    """Recomputed vs logged verdicts (records with a known logged reason)."""
+    known = cols["logged"] >= 0
+    return {
+        "compared": int(known.sum()),
+        "mismatched": int((codes[known] != cols["logged"][known]).sum()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score logged experiments' causality.")
+    parser.add_argument("source", type=Path, help="experiments JSONL, or a .npz column cache")
+    parser.add_argument("--threshold", type=float, default=0.25, help="max_expected_change (config A)")
+    parser.add_argument("--compare", type=float, help="max_expected_change for config B")
+    parser.add_argument("--cache", type=Path, help="write the loaded columns here (.npz)")
+    args = parser.parse_args(argv)
+
+    if args.source.suffix == ".npz":
+        cols = open_columns(args.source)
+    else:
+        cols = load_jsonl(args.source)
+    if args.cache:
+        save_columns(cols, args.cache)
+
+    config_a = {"max_expected_change": args.threshold}
+    _, codes = evaluate(cols, **config_a)
+    report = {
+        "records": int(codes.size),
+        "reasons": reason_counts(codes),
+        "agreement_with_log": agreement(cols, codes),
+    }
+    if args.compare is not None:
+        report["comparison"] = compare(cols, config_a, {"max_expected_change": args.compare})
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -58,8 +58,13 @@ def evaluate_causality(
                 "reason": "change_outside_window"
             }
 
-        # Outlier: too much change for a single primitive action
+        # Outlier: too much change for a single primitive action.
+        # With regions, judged per region: unrelated changes elsewhere
+        # (cursor blink, clock) do not add up to one outlier.
         pct = delta.get("percent_changed") or 0.0
+        regions = delta.get("regions")
+        if regions:
+            pct = max(r.get("percent_changed") or 0.0 for r in regions)
         if pct > max_expected_change:
             return {
                 "attributed": False,
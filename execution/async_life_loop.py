@@ -0,0 +1,111 @@
+"""
+ASYNC LIFE LOOP
+
+Same experiment, same record, driven from asyncio:
+1) capture pre-screen          → dedicated capture thread
+2) execute exactly one action  → awaited if a coroutine, else capture thread
+3) capture post-screen         → dedicated capture thread
+4–6) delta, causality, log     → single conclude thread (records stay in order)
+
+Concurrent run_experiment() calls on one loop are serialized for steps
+1–3 and overlap only with the conclusion of earlier experiments.
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core import tracing
+from core.logger import Logger, log_event
+from execution.life_loop import LifeLoop, Observation
+from perception.screen_adapter import ScreenAdapter
+
+
+class AsyncLifeLoop(LifeLoop):
+    """
+    Executes one action per awaited run_experiment().
+    Blocking work never runs on the event loop thread.
+    """
+
+    def __init__(self, action_executor, logger: Logger, screen: ScreenAdapter = None, **options):
+        # capture handles are thread-bound: create and use them on one thread
+        self._capture_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        self._conclude_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="conclude")
+
+        if screen is None:
+            screen = self._capture_pool.submit(ScreenAdapter).result()
+
+        super().__init__(action_executor, logger, screen=screen, **options)
+
+        self._observe_lock = None
+
+    async def run_experiment(self, action):
+        obs = await self.observe_async(action)
+
+        # submit in observe order; the single conclude thread keeps it
+        future = self._conclude_pool.submit(self.conclude, obs)
+        return await asyncio.wrap_future(future)
+
+    async def observe_async(self, action) -> Observation:
+        if self._observe_lock is None:
+            self._observe_lock = asyncio.Lock()
+
+        async with self._observe_lock:
+            return await self._observe(action)
+
+    async def _observe(self, action) -> Observation:
+        loop = asyncio.get_running_loop()
+
+        log_event("experiment.begin")
+
+        experiment_id = self._generate_experiment_id()
+
+        region = getattr(action, "region", None) if self._use_action_region else None
+        phases = tracing.new_phases()
+
+        # ---- PRE SNAPSHOT ----
+        pre_snap = None
+        if self._ring is None:
+            pre_snap = await loop.run_in_executor(self._capture_pool, self._capture, region, "pre_capture", phases)
+
+        start = time.perf_counter()
+        result = None
+        err = None
+
+        try:
+            log_event("experiment.dispatch")
+            result = await self._execute(loop, action)
+        except Exception as e:
+            err = str(e)
+            log_event("experiment.failure")
+
+        end = time.perf_counter()
+
+        # other tasks share this thread across the await: no span binding here
+        if phases is not None:
+            phases["action"] = end - start
+
+        # ---- POST SNAPSHOT ----
+        if self._ring is None:
+            post_snap = await loop.run_in_executor(self._capture_pool, self._capture, region, "post_capture", phases)
+        else:
+            pre_snap, post_snap = await loop.run_in_executor(
+                self._capture_pool, self._select_from_ring, start, end, phases
+            )
+
+        return Observation(experiment_id, action, start, end, result, err, pre_snap, post_snap, phases)
+
+    async def _execute(self, loop, action):
+        if inspect.iscoroutinefunction(getattr(action, "run", None)):
+            # execute() only creates the coroutine; await it on this loop
+            return await self._action_executor.execute(action)
+
+        result = await loop.run_in_executor(self._capture_pool, self._action_executor.execute, action)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def close(self):
+        self._capture_pool.shutdown(wait=True)
+        self._conclude_pool.shutdown(wait=True)
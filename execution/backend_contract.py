@@ -25,5 +25,14 @@ class OSBackend:
     def capture_screen(self) -> Tuple[Any, float, dict]:
         """
         Returns frame, timestamp, metadata
+
+        frame: (H, W, 4) BGRA array. timestamp: perf_counter() right after
+        the grab. metadata: left/top/width/height of the frame in
+        virtual-screen coordinates, plus buffer_reused=True when the frame
+        is overwritten by the next capture (keep it → copy it).
+
+        A backend driving several displays may also expose `monitors`: a
+        list of left/top/width/height dicts, one per physical monitor,
+        within the captured frame.
         """
         raise NotImplementedError
@@ -9,75 +9,173 @@ One experiment:
 5) evaluate causality
 6) log the record
 
+With tracing enabled (core.tracing) the record also carries `phases`:
+summed span durations (seconds) up to the durability barrier.
+
+Per-monitor mode (per_monitor=True): every physical monitor is captured
+and measured as its own frame, concurrently. `monitors` lists each
+monitor's snapshots and delta; the top-level snapshots and delta cover
+all monitors together (bounding rectangle, summed pixels, latest capture
+times), so causality and downstream readers see the usual fields.
+
 No AI. No guessing. No normalization. No retries.
 """
 
 import time
 import hashlib
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
+from core import metrics, tracing
 from core.logger import Logger, log_crash, log_event
 from perception.screen_adapter import ScreenAdapter, ScreenSnapshot
+from perception.capture_ring import CaptureRing
+from perception.delta_cache import DeltaCache
+from perception.diff import DELTA_MODES, frame_delta, load_frame, load_raw_frame, unchanged_delta
+from perception.regions import DEFAULT_MAX_REGIONS
 from core.delta import Delta
 from evaluation.causality import evaluate_causality
 
 
 def _load_raw_frame(path: str, width: int, height: int):
-    """Load raw BGRA frame from disk exactly as written."""
-    try:
-        with open(path, "rb") as f:
-            raw = f.read()
-    except Exception as e:
-        raise RuntimeError(f"Failed reading snapshot: {e}")
-
-    expected = width * height * 4
-    if len(raw) != expected:
-        raise RuntimeError(
-            f"Frame size mismatch: expected {expected} bytes, got {len(raw)}"
-        )
-
-    arr = np.frombuffer(raw, dtype=np.uint8)
-    arr = arr.reshape((height, width, 4))
-    return arr
+    """Load raw BGRA frame from disk exactly as written (decoded if encoded)."""
+    return load_raw_frame(path, width, height)
 
 
-def _compute_delta(pre: ScreenSnapshot, post: ScreenSnapshot):
+def _compute_delta(pre: ScreenSnapshot, post: ScreenSnapshot, cache: DeltaCache = None, mode: str = "full"):
     """
     Strict pixel delta.
     No semantics. No filters. No smoothing.
+    Coordinates are relative to the captured region.
+    With a DeltaCache, a recurring checksum pair is not re-measured;
+    without one, identical checksums still skip the pixels.
+    mode: diff.DELTA_MODES ("pyramid" gives the same delta, cheaper on large frames).
     """
 
-    pre_arr = _load_raw_frame(pre.path, pre.width, pre.height)
-    post_arr = _load_raw_frame(post.path, post.width, post.height)
+    region = getattr(pre, "region", None)
+    if region != getattr(post, "region", None):
+        raise RuntimeError("Snapshot region mismatch")
+
+    def measure():
+        if pre.checksum == post.checksum and (pre.width, pre.height) == (post.width, post.height):
+            pre_tiles = getattr(pre, "tiles", None)
+            compatible = pre_tiles is not None and pre_tiles.compatible(getattr(post, "tiles", None))
+            return unchanged_delta(pre.width, pre.height, pre_tiles.tile_size if compatible else None)
+
+        return frame_delta(
+            load_frame(pre),
+            load_frame(post),
+            getattr(pre, "tiles", None),
+            getattr(post, "tiles", None),
+            mode=mode,
+        )
+
+    measured = measure() if cache is None else cache.measure(pre, post, measure)
+
+    return {
+        "error": None,
+        "pre_checksum": pre.checksum,
+        "post_checksum": post.checksum,
+        **measured,
+        "region": region,
+    }
 
-    if pre_arr.shape != post_arr.shape:
-        raise RuntimeError("Snapshot dimension mismatch")
 
-    diff = np.any(pre_arr != post_arr, axis=2)
-    pixels_total = diff.size
-    pixels_changed = int(np.count_nonzero(diff))
+def _snapshot_entry(snap: ScreenSnapshot) -> dict:
+    return {
+        "path": str(snap.path),
+        "timestamp": snap.timestamp_monotonic,
+        "timestamp_wall": snap.timestamp_wall,
+        "width": snap.width,
+        "height": snap.height,
+        "checksum": snap.checksum,
+        "hash_algorithm": getattr(snap, "hash_algorithm", "sha256"),
+        "region": getattr(snap, "region", None),
+    }
 
-    if pixels_total == 0:
-        raise RuntimeError("Zero-sized frame")
 
-    # bounding box of change
-    if pixels_changed > 0:
-        ys, xs = np.where(diff)
-        bbox = [int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())]
-    else:
-        bbox = None
+def _bounds(regions):
+    left = min(r[0] for r in regions)
+    top = min(r[1] for r in regions)
+    right = max(r[0] + r[2] for r in regions)
+    bottom = max(r[1] + r[3] for r in regions)
+    return [left, top, right - left, bottom - top]
+
+
+def _combined_entry(entries) -> dict:
+    """Top-level snapshot entry for several monitors: no single file, latest capture."""
+    bounds = _bounds([e["region"] for e in entries])
+    return {
+        "path": None,
+        "timestamp": max(e["timestamp"] for e in entries),
+        "timestamp_wall": max(e["timestamp_wall"] for e in entries),
+        "width": bounds[2],
+        "height": bounds[3],
+        "checksum": None,
+        "hash_algorithm": entries[0]["hash_algorithm"],
+        "region": bounds,
+    }
+
+
+def _combine_deltas(deltas, max_regions: int = DEFAULT_MAX_REGIONS) -> dict:
+    """
+    One delta over several monitors' deltas: pixels summed, bbox and
+    regions moved into the monitors' bounding rectangle. A region keeps
+    its own monitor's percent_changed and names it in `monitor`.
+    """
+    bounds = _bounds([d["region"] for d in deltas])
+    pixels_total = sum(d["pixels_total"] for d in deltas)
+    pixels_changed = sum(d["pixels_changed"] for d in deltas)
+
+    bbox = None
+    regions = []
+    truncated = False
+    for i, d in enumerate(deltas):
+        dx, dy = d["region"][0] - bounds[0], d["region"][1] - bounds[1]
+
+        if d["bbox"] is not None:
+            x0, y0, x1, y1 = d["bbox"]
+            b = [x0 + dx, y0 + dy, x1 + dx, y1 + dy]
+            bbox = b if bbox is None else [min(bbox[0], b[0]), min(bbox[1], b[1]), max(bbox[2], b[2]), max(bbox[3], b[3])]
+
+        for region in d.get("regions") or []:
+            x0, y0, x1, y1 = region["bbox"]
+            regions.append({**region, "bbox": [x0 + dx, y0 + dy, x1 + dx, y1 + dy], "monitor": i})
+        truncated = truncated or bool(d.get("regions_truncated"))
+
+    regions.sort(key=lambda r: (-r["pixels_changed"], r["bbox"]))
 
     return {
         "error": None,
-        "pre_checksum": pre.checksum,
-        "post_checksum": post.checksum,
-        "pixels_total": int(pixels_total),
+        "pixels_total": pixels_total,
         "pixels_changed": pixels_changed,
         "percent_changed": float(pixels_changed / pixels_total),
         "bbox": bbox,
+        "regions": regions[:max_regions],
+        "regions_truncated": truncated or len(regions) > max_regions,
+        "monitors_changed": [i for i, d in enumerate(deltas) if d["pixels_changed"]],
+        "region": bounds,
     }
 
 
+class Observation:
+    """
+    Raw outcome of one experiment before measurement (see LifeLoop.observe).
+    """
+
+    __slots__ = ("experiment_id", "action", "start", "end", "result", "err", "pre_snap", "post_snap", "phases")
+
+    def __init__(self, experiment_id, action, start, end, result, err, pre_snap, post_snap, phases=None):
+        self.experiment_id = experiment_id
+        self.action = action
+        self.start = start
+        self.end = end
+        self.result = result
+        self.err = err
+        self.pre_snap = pre_snap
+        self.post_snap = post_snap
+        self.phases = phases
+
+
 class LifeLoop:
     """
     Executes one action.
@@ -85,24 +183,62 @@ class LifeLoop:
     Refuses to lie.
     """
 
-    def __init__(self, action_executor, logger: Logger):
+    def __init__(self, action_executor, logger: Logger, screen: ScreenAdapter = None,
+                 use_action_region: bool = False, ring: CaptureRing = None, delta_cache: DeltaCache = None,
+                 delta_mode: str = "full", per_monitor: bool = False):
         if not hasattr(action_executor, "execute") or not callable(action_executor.execute):
             raise TypeError("action_executor must implement execute()")
 
         if not hasattr(logger, "record") or not callable(logger.record):
             raise TypeError("logger must implement record()")
 
+        if screen is not None and (not hasattr(screen, "capture") or not callable(screen.capture)):
+            raise TypeError("screen must implement capture()")
+
         self._action_executor = action_executor
         self._logger = logger
-        self._screen = ScreenAdapter()
+        self._screen = screen if screen is not None else ScreenAdapter()
+
+        # capture only action.region (left, top, width, height) when declared
+        self._use_action_region = use_action_region
+
+        # with a running CaptureRing, pre/post frames are selected from the
+        # ring after the action (its own region applies) and only those persisted
+        self._ring = ring
+
+        # memoizes deltas by checksum pair (identical frames skip the diff)
+        self._delta_cache = delta_cache
+
+        if delta_mode not in DELTA_MODES:
+            raise ValueError(f"delta_mode must be one of {DELTA_MODES}")
+        self._delta_mode = delta_mode
+
+        # one snapshot and delta per physical monitor, measured in parallel
+        if per_monitor:
+            if ring is not None or use_action_region:
+                raise ValueError("per_monitor captures whole monitors: no ring, no action region")
+            if not callable(getattr(self._screen, "capture_monitors", None)):
+                raise TypeError("screen must implement capture_monitors()")
+        self._per_monitor = per_monitor
+        self._delta_pool = None
 
     def run_experiment(self, action):
+        return self.conclude(self.observe(action))
+
+    def observe(self, action) -> "Observation":
+        """
+        Steps 1–3: everything that touches the screen or the action.
+        The result can be concluded later, on another thread.
+        """
         log_event("experiment.begin")
 
         experiment_id = self._generate_experiment_id()
 
+        region = getattr(action, "region", None) if self._use_action_region else None
+        phases = tracing.new_phases()
+
         # ---- PRE SNAPSHOT ----
-        pre_snap = self._screen.capture()
+        pre_snap = self._capture(region, "pre_capture", phases) if self._ring is None else None
 
         start = time.perf_counter()
         result = None
@@ -110,7 +246,8 @@ class LifeLoop:
 
         try:
             log_event("experiment.dispatch")
-            result = self._action_executor.execute(action)
+            with tracing.collect(phases), tracing.span("action"):
+                result = self._action_executor.execute(action)
         except Exception as e:
             err = str(e)
             log_event("experiment.failure")
@@ -118,19 +255,62 @@ class LifeLoop:
         end = time.perf_counter()
 
         # ---- POST SNAPSHOT ----
-        post_snap = self._screen.capture()
+        if self._ring is None:
+            post_snap = self._capture(region, "post_capture", phases)
+        else:
+            pre_snap, post_snap = self._select_from_ring(start, end, phases)
+
+        return Observation(experiment_id, action, start, end, result, err, pre_snap, post_snap, phases)
+
+    def conclude(self, obs: "Observation"):
+        """
+        Steps 4–6: delta, causality, durability barrier, log.
+        Never touches the screen; conclude observations in observe order.
+        """
+        with tracing.collect(obs.phases):
+            return self._conclude(obs, obs.phases)
+
+    def _conclude(self, obs: "Observation", phases):
+        experiment_id, action = obs.experiment_id, obs.action
+        start, end = obs.start, obs.end
+        result, err = obs.result, obs.err
+        pre_snap, post_snap = obs.pre_snap, obs.post_snap
 
         # ---- DELTA ----
-        delta_data = _compute_delta(pre_snap, post_snap)
-        delta = Delta(delta_data)
+        t0 = time.perf_counter()
+        with tracing.span("delta"):
+            if self._per_monitor:
+                monitor_deltas = self._monitor_deltas(pre_snap, post_snap)
+                delta_data = _combine_deltas(monitor_deltas)
+            else:
+                delta_data = _compute_delta(pre_snap, post_snap, self._delta_cache, self._delta_mode)
+            delta = Delta(delta_data)
+        metrics.DELTA_SECONDS.observe(time.perf_counter() - t0)
+
+        if self._per_monitor:
+            monitors = [
+                {"index": i, "pre_snapshot": _snapshot_entry(p), "post_snapshot": _snapshot_entry(q), "delta": d}
+                for i, (p, q, d) in enumerate(zip(pre_snap, post_snap, monitor_deltas))
+            ]
+            pre_entry = _combined_entry([m["pre_snapshot"] for m in monitors])
+            post_entry = _combined_entry([m["post_snapshot"] for m in monitors])
+            frames = {}
+            for m in monitors:
+                frames[f"pre.{m['index']}"] = m["pre_snapshot"]["checksum"]
+                frames[f"post.{m['index']}"] = m["post_snapshot"]["checksum"]
+        else:
+            monitors = None
+            pre_entry, post_entry = _snapshot_entry(pre_snap), _snapshot_entry(post_snap)
+            frames = {"pre": pre_snap.checksum, "post": post_snap.checksum}
 
         # ---- CAUSALITY ----
-        causality = evaluate_causality(
-            delta=delta.to_dict(),
-            time_window=(start, end),
-            pre_ts=pre_snap.timestamp_monotonic,
-            post_ts=post_snap.timestamp_monotonic,
-        )
+        with tracing.span("causality"):
+            causality = evaluate_causality(
+                delta=delta.to_dict(),
+                time_window=(start, end),
+                pre_ts=pre_entry["timestamp"],
+                post_ts=post_entry["timestamp"],
+            )
 
         record = {
             "experiment_id": experiment_id,
@@ -143,29 +323,41 @@ class LifeLoop:
             "raw_result": repr(result),
             "raw_error": err,
 
-            "pre_snapshot": {
-                "path": str(pre_snap.path),
-                "timestamp": pre_snap.timestamp_monotonic,
-                "width": pre_snap.width,
-                "height": pre_snap.height,
-                "checksum": pre_snap.checksum,
-            },
-
-            "post_snapshot": {
-                "path": str(post_snap.path),
-                "timestamp": post_snap.timestamp_monotonic,
-                "width": post_snap.width,
-                "height": post_snap.height,
-                "checksum": post_snap.checksum,
-            },
+            "pre_snapshot": pre_entry,
+            "post_snapshot": post_entry,
 
             "delta": delta.to_dict(),
             "causality": causality,
         }
 
+        if monitors is not None:
+            record["monitors"] = monitors
+
+        # Snapshots must be durable before the record points at them
+        # (only this experiment's: a pipelined next observation keeps writing)
         try:
-            self._logger.record(record)
+            flush = getattr(self._screen, "flush", None)
+            if flush is not None:
+                snaps = list(pre_snap) + list(post_snap) if self._per_monitor else [pre_snap, post_snap]
+                with tracing.span("durability"):
+                    flush(snaps)
+
+            store = getattr(self._screen, "store", None)
+            if store is not None:
+                store.record_experiment(experiment_id, frames)
+        except Exception as e:
+            log_crash(f"PERSISTENCE FAILED: {e}")
+            raise
+
+        if phases is not None:
+            record["phases"] = dict(phases)
+
+        try:
+            with tracing.span("log"):
+                self._logger.record(record)
             log_event("experiment.recorded")
+            metrics.EXPERIMENTS.labels("ok" if err is None else "action_error").inc()
+            metrics.CAUSALITY.labels(causality.get("reason", "unknown")).inc()
         except Exception as e:
             log_crash(f"LOGGING FAILED: {e}")
             raise
@@ -173,6 +365,41 @@ class LifeLoop:
         log_event("experiment.complete")
         return record
 
+    def _monitor_deltas(self, pre_snaps, post_snaps):
+        if len(pre_snaps) != len(post_snaps):
+            raise RuntimeError("Monitor layout changed during experiment")
+
+        if self._delta_pool is None:
+            self._delta_pool = ThreadPoolExecutor(max_workers=len(pre_snaps), thread_name_prefix="monitor-delta")
+
+        return tracing.pool_map(
+            self._delta_pool,
+            lambda pair: _compute_delta(pair[0], pair[1], self._delta_cache, self._delta_mode),
+            list(zip(pre_snaps, post_snaps)),
+        )
+
+    def _capture(self, region, phase="capture", phases=None):
+        # runs on whichever thread captures; bind the phases there
+        with tracing.collect(phases), tracing.span(phase):
+            if self._per_monitor:
+                return self._screen.capture_monitors()
+            if region is None:
+                return self._screen.capture()
+            return self._screen.capture(region=region)
+
+    def _select_from_ring(self, start, end, phases=None):
+        with tracing.collect(phases):
+            with tracing.span("ring_wait"):
+                pre = self._ring.latest_before(start)
+                post = self._ring.first_stable_after(end)
+            if not post.stable:
+                log_event("experiment.post_unstable")
+
+            with tracing.span("persist"):
+                pre_snap = self._screen.persist_frame(pre.frame, pre.t_after, pre.t_wall, pre.region)
+                post_snap = self._screen.persist_frame(post.frame, post.t_after, post.t_wall, post.region)
+            return pre_snap, post_snap
+
     def _generate_experiment_id(self):
         t = time.perf_counter_ns()
         return hashlib.sha256(str(t).encode()).hexdigest()[:16]
@@ -0,0 +1,236 @@
+"""
+CAPTURE RING — CONTINUOUS BACKGROUND CAPTURE
+
+A thread grabs the screen at a fixed rate into a preallocated ring of
+frames, each stamped with monotonic time around the grab.
+
+Selection:
+- latest_before(t): newest frame whose grab finished before t
+- first_stable_after(t): first frame whose grab started after t and that
+  stays pixel-identical for `stable_frames` consecutive grabs
+
+Rules:
+- Frames are copied out of the ring; callers never alias ring memory
+- A requested frame already overwritten is an error, never a substitute
+- Nothing is persisted here
+"""
+
+import time
+import threading
+from typing import Optional
+
+import mss
+import numpy as np
+
+from perception.screen_adapter import resolve_region, check_frame
+
+
+class RingFrame:
+    """
+    One frame selected from the ring (private copy).
+    """
+
+    __slots__ = ("frame", "t_before", "t_after", "t_wall", "region", "seq", "stable")
+
+    def __init__(self, frame, t_before, t_after, t_wall, region, seq, stable=True):
+        self.frame = frame
+        self.t_before = float(t_before)
+        self.t_after = float(t_after)
+        self.t_wall = float(t_wall)
+        self.region = list(region)
+        self.seq = int(seq)
+        self.stable = bool(stable)
+
+
+class CaptureRing:
+    """
+    Background capture at `fps` into `capacity` preallocated slots.
+    The ring must span the longest action: capacity / fps seconds.
+    """
+
+    def __init__(self, fps: float = 60.0, capacity: int = 64, region=None, source_factory=None):
+        if fps <= 0 or capacity < 2:
+            raise ValueError("fps must be > 0 and capacity >= 2")
+
+        self._interval = 1.0 / fps
+        self._capacity = capacity
+        self._region = region
+        self._source_factory = source_factory or mss.mss
+
+        self._cond = threading.Condition()
+        self._frames = None
+        self._t_before = np.zeros(capacity, dtype=np.float64)
+        self._t_after = np.zeros(capacity, dtype=np.float64)
+        self._t_wall = np.zeros(capacity, dtype=np.float64)
+        self._monitor = None
+        self._seq = 0              # number of frames written so far
+        self._error: Optional[str] = None
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---- lifecycle ----
+
+    def start(self) -> "CaptureRing":
+        if self._thread is not None:
+            return self
+        with self._cond:
+            # a retry after a failed start begins from an empty ring
+            self._seq = 0
+            self._error = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="capture-ring", daemon=True)
+        self._thread.start()
+
+        # first frame fixes the geometry; fail fast if capture is broken
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > 0 or self._error is not None, timeout=5.0)
+            failure = self._error
+            started = self._seq > 0
+
+        if failure is not None or not started:
+            # never leave a broken ring running: a retried start() must start over
+            self.stop()
+            raise RuntimeError(
+                f"Capture ring failure: {failure}" if failure is not None else "Capture ring produced no frame"
+            )
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def region(self):
+        m = self._monitor
+        return [m["left"], m["top"], m["width"], m["height"]]
+
+    # ---- capture thread ----
+
+    def _run(self) -> None:
+        try:
+            # mss handles are not shareable across threads: own one here
+            sct = self._source_factory()
+            monitor = resolve_region(sct.monitors[0], self._region)
+            h, w = monitor["height"], monitor["width"]
+            frames = np.empty((self._capacity, h, w, 4), dtype=np.uint8)
+
+            with self._cond:
+                self._monitor = monitor
+                self._frames = frames
+
+            next_tick = time.perf_counter()
+            while not self._stop.is_set():
+                t_before = time.perf_counter()
+                grabbed = np.asarray(sct.grab(monitor), dtype=np.uint8)
+                t_after = time.perf_counter()
+                t_wall = time.time()
+
+                check_frame(grabbed, monitor)
+
+                with self._cond:
+                    slot = self._seq % self._capacity
+                    frames[slot] = grabbed
+                    self._t_before[slot] = t_before
+                    self._t_after[slot] = t_after
+                    self._t_wall[slot] = t_wall
+                    self._seq += 1
+                    self._cond.notify_all()
+
+                next_tick += self._interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    next_tick = time.perf_counter()
+
+        except Exception as e:
+            with self._cond:
+                self._error = str(e)
+                self._cond.notify_all()
+
+    # ---- selection (caller threads) ----
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Capture ring failure: {self._error}")
+
+    def _oldest_seq(self) -> int:
+        return max(0, self._seq - self._capacity)
+
+    def _take(self, seq: int, stable: bool = True) -> RingFrame:
+        slot = seq % self._capacity
+        return RingFrame(
+            frame=self._frames[slot].copy(),
+            t_before=self._t_before[slot],
+            t_after=self._t_after[slot],
+            t_wall=self._t_wall[slot],
+            region=self.region,
+            seq=seq,
+            stable=stable,
+        )
+
+    def latest_before(self, t: float) -> RingFrame:
+        """Newest frame whose grab completed at or before t."""
+        with self._cond:
+            self._raise_if_failed()
+            oldest = self._oldest_seq()
+            for seq in range(self._seq - 1, oldest - 1, -1):
+                if self._t_after[seq % self._capacity] <= t:
+                    return self._take(seq)
+
+        raise RuntimeError("Capture ring overrun: no retained frame before requested time")
+
+    def first_stable_after(self, t: float, stable_frames: int = 2, timeout: float = 1.0) -> RingFrame:
+        """
+        First frame whose grab started at or after t and that is followed by
+        stable_frames - 1 identical frames. On timeout, the newest frame
+        after t is returned with stable=False.
+        """
+        deadline = time.perf_counter() + timeout
+        candidate = None
+
+        with self._cond:
+            while True:
+                self._raise_if_failed()
+
+                oldest = self._oldest_seq()
+                if candidate is None:
+                    for seq in range(oldest, self._seq):
+                        if self._t_before[seq % self._capacity] >= t:
+                            candidate = seq
+                            break
+                elif candidate < oldest:
+                    raise RuntimeError("Capture ring overrun while waiting for a stable frame")
+
+                if candidate is not None:
+                    run_end = candidate
+                    while run_end + 1 < self._seq and np.array_equal(
+                        self._frames[candidate % self._capacity],
+                        self._frames[(run_end + 1) % self._capacity],
+                    ):
+                        run_end += 1
+
+                    if run_end - candidate + 1 >= stable_frames:
+                        return self._take(candidate)
+
+                    # run broken by a different frame → restart from it
+                    if run_end + 1 < self._seq:
+                        candidate = run_end + 1
+                        continue
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    if candidate is None:
+                        raise RuntimeError("Capture ring produced no frame after requested time")
+                    return self._take(self._seq - 1, stable=False)
+
+                self._cond.wait(remaining)
@@ -0,0 +1,169 @@
+"""
+DELTA CACHE — MEMOIZED FRAME DELTAS
+
+A delta is a pure function of the two frames' bytes and shape, so it
+can be reused whenever the same (pre, post) checksum pair recurs.
+
+Rules:
+- Identical checksums (same size) never touch pixels: the delta is the
+  exact frame_delta result for two identical frames
+- Keys carry schema version, hash algorithm, both checksums, size and tile size
+- Entries are stored as JSON text; every get returns fresh objects
+- In-memory LRU bounded in bytes; optional SQLite file survives restarts
+- The SQLite file carries DELTA_SCHEMA_VERSION (user_version); a file
+  from another version is emptied on open, never served
+- A cache failure never fails a delta: it degrades to computing it
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from core import metrics
+from perception.diff import unchanged_delta
+
+
+# bump whenever the shape or meaning of a frame_delta result changes
+DELTA_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deltas (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _tile_size(pre, post):
+    pre_tiles = getattr(pre, "tiles", None)
+    if pre_tiles is not None and pre_tiles.compatible(getattr(post, "tiles", None)):
+        return pre_tiles.tile_size
+    return None
+
+
+class DeltaCache:
+    """
+    measure(pre, post, compute) → frame_delta-style dict for two snapshots,
+    from the cache when possible, else compute() (then cached).
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20, path: Path = None):
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.identical = 0
+        self.evictions = 0
+
+        self._conn = None
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version != DELTA_SCHEMA_VERSION:
+                self._conn.execute("DELETE FROM deltas")
+                self._conn.execute(f"PRAGMA user_version = {DELTA_SCHEMA_VERSION:d}")
+            self._conn.commit()
+
+    def measure(self, pre, post, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        tile_size = _tile_size(pre, post)
+        same_size = (pre.width, pre.height) == (post.width, post.height)
+
+        if pre.checksum == post.checksum and same_size:
+            with self._lock:
+                self.identical += 1
+            metrics.DELTA_CACHE.labels("identical").inc()
+            return unchanged_delta(pre.width, pre.height, tile_size)
+
+        key = ":".join((
+            f"v{DELTA_SCHEMA_VERSION}",
+            getattr(pre, "hash_algorithm", "sha256"),
+            pre.checksum,
+            post.checksum,
+            f"{pre.width}x{pre.height}",
+            f"{post.width}x{post.height}",
+            str(tile_size),
+        ))
+
+        text = self._get(key)
+        if text is not None:
+            metrics.DELTA_CACHE.labels("hit").inc()
+            return json.loads(text)
+
+        with self._lock:
+            self.misses += 1
+        metrics.DELTA_CACHE.labels("miss").inc()
+
+        measured = compute()
+        try:
+            self._put(key, json.dumps(measured, separators=(",", ":")), persist=True)
+        except Exception:
+            pass
+        return measured
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses + self.identical
+            return {
+                "lookups": lookups,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "identical": self.identical,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else None,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _get(self, key: str):
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute("SELECT value FROM deltas WHERE key = ?", (key,)).fetchone()
+            except Exception:
+                return None
+            if row is None:
+                return None
+            self.disk_hits += 1
+
+        self._put(key, row[0], persist=False)
+        return row[0]
+
+    def _put(self, key: str, text: str, persist: bool) -> None:
+        with self._lock:
+            if key not in self._entries and len(text) <= self._max_bytes:
+                self._entries[key] = text
+                self._bytes += len(text)
+                while self._bytes > self._max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= len(old)
+                    self.evictions += 1
+
+            if persist and self._conn is not None:
+                self._conn.execute("INSERT OR IGNORE INTO deltas (key, value) VALUES (?, ?)", (key, text))
+                self._conn.commit()
@@ -7,68 +7,248 @@ Compute level-0 deltas:
 - percent changed
 - bounding box of changed region (if any)
 
+One implementation for the life loop and offline analysis:
+- a pixel is changed if any channel differs
+- bbox is [x_min, y_min, x_max, y_max], inclusive
+- regions cluster touching changed cells, largest first
+- tile maps: only changed tiles are compared, unless more than
+  TILE_FALLBACK_FRACTION of them changed (then the frame path; same result)
+- mode "pyramid": unchanged row bands are skipped by an exact equality
+  test; the change mask is only built inside changed bands (same result,
+  memory and time scale with how much changed)
+- checksums are the snapshots' own (their hash_algorithm); a bare frame
+  gets SHA-256 over its pixel bytes
+
 No semantics. No guesses. Pure measurement.
 """
 
 import hashlib
 from pathlib import Path
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Optional
+
+import numpy as np
+from PIL import Image
+
+from perception.snapshot_reader import SnapshotReader
+from perception.tiles import TileMap, changed_tiles, tile_delta
+from perception.regions import (
+    DEFAULT_CELL_SIZE,
+    DEFAULT_MAX_REGIONS,
+    cells_from_mask,
+    segment_regions,
+)
+
+
+_RAW_SUFFIXES = (".bin", ".emz")
+
+DELTA_MODES = ("full", "pyramid")
+
+# above this share of changed tiles, gathering them costs more than one
+# whole-frame pass (break-even measured at 4K): the frame path measures,
+# the tile fields stay
+TILE_FALLBACK_FRACTION = 0.4
+
+
+def _checksum(arr: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(arr)).hexdigest()
+
+
+def load_raw_frame(path, width: int, height: int) -> np.ndarray:
+    """Read-only raw BGRA frame exactly as written (memory-mapped, or decoded if encoded)."""
+    try:
+        return SnapshotReader(path, width, height).frame()
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed reading snapshot: {e}")
+
+
+def load_frame(src, width: int = None, height: int = None) -> np.ndarray:
+    """
+    Frame array (H, W, C) from any supported source:
+    - numpy array (used as-is)
+    - snapshot object (in-memory frame, else its raw file)
+    - raw .bin/.emz path (width and height required)
+    - image path (PNG etc.), decoded to RGBA
+    """
+    if isinstance(src, np.ndarray):
+        return src
+
+    if hasattr(src, "checksum") and hasattr(src, "path"):
+        frame = getattr(src, "frame", None)
+        if frame is not None:
+            return frame
+        return load_raw_frame(src.path, src.width, src.height)
+
+    path = Path(src)
+    if path.suffix in _RAW_SUFFIXES:
+        if width is None or height is None:
+            raise RuntimeError("Raw snapshot requires width and height")
+        return load_raw_frame(path, width, height)
+
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGBA"))
+
+
+def _pixel_words(arr: np.ndarray) -> Optional[np.ndarray]:
+    """(H, W) uint32 view of a contiguous BGRA frame (one word per pixel), else None."""
+    if arr.ndim == 3 and arr.shape[2] == 4 and arr.dtype == np.uint8 and arr.flags.c_contiguous:
+        return arr.view(np.uint32).reshape(arr.shape[:2])
+    return None
 
-from PIL import Image, ImageChops, ImageStat
 
+def _change_mask(pre_arr: np.ndarray, post_arr: np.ndarray, pre_words=None, post_words=None) -> np.ndarray:
+    """(H, W) bool: pixel changed if any channel differs."""
+    if pre_words is not None and post_words is not None:
+        return pre_words != post_words
+    if pre_arr.ndim == 3:
+        return np.any(pre_arr != post_arr, axis=2)
+    return pre_arr != post_arr
 
-def _checksum(path: Path) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
 
+def pyramid_cells(pre_arr: np.ndarray, post_arr: np.ndarray, cell: int = DEFAULT_CELL_SIZE):
+    """
+    cells_from_mask(change mask) without building the full mask:
+    1) each band of `cell` rows is tested for exact equality, unchanged → skipped
+    2) a changed band gets a pixel mask of its own rows only → per-cell stats
+    """
+    pre_words, post_words = _pixel_words(pre_arr), _pixel_words(post_arr)
+    words = pre_words is not None and post_words is not None
+
+    cells = []
+    for band, y0 in enumerate(range(0, pre_arr.shape[0], cell)):
+        y1 = y0 + cell
+        if words and np.array_equal(pre_words[y0:y1], post_words[y0:y1]):
+            continue
+
+        mask = _change_mask(
+            pre_arr[y0:y1], post_arr[y0:y1],
+            pre_words[y0:y1] if words else None,
+            post_words[y0:y1] if words else None,
+        )
+        for _, cx, n, (bx0, by0, bx1, by1) in cells_from_mask(mask, cell):
+            cells.append((band, cx, n, [bx0, y0 + by0, bx1, y0 + by1]))
+    return cells
+
+
+def frame_delta(
+    pre_arr: np.ndarray,
+    post_arr: np.ndarray,
+    pre_tiles: Optional[TileMap] = None,
+    post_tiles: Optional[TileMap] = None,
+    max_regions: int = DEFAULT_MAX_REGIONS,
+    mode: str = "full",
+) -> Dict[str, Any]:
+    """
+    Strict pixel delta between two frames. Raises on invalid input.
+    Uses tile digests when both frames carry compatible tile maps.
+    mode: "full" or "pyramid" (identical result, see module notes).
+    """
+    if mode not in DELTA_MODES:
+        raise RuntimeError(f"Unknown delta mode: {mode}")
+
+    if pre_arr.shape != post_arr.shape:
+        raise RuntimeError("Snapshot dimension mismatch")
+
+    pixels_total = pre_arr.shape[0] * pre_arr.shape[1]
+    if pixels_total == 0:
+        raise RuntimeError("Zero-sized frame")
+
+    extra = {}
+    changed = None
+    if pre_tiles is not None and pre_tiles.compatible(post_tiles):
+        changed = changed_tiles(pre_tiles, post_tiles)
+        extra = {
+            "tile_size": pre_tiles.tile_size,
+            "tiles_changed": changed[:, ::-1].tolist(),
+        }
+        if len(changed) > TILE_FALLBACK_FRACTION * pre_tiles.digests.size:
+            changed = None
+
+    if changed is not None:
+        # incremental: exact comparison inside changed tiles only
+        tiled = tile_delta(pre_arr, post_arr, pre_tiles, post_tiles, changed=changed)
+        pixels_changed = tiled["pixels_changed"]
+        bbox = tiled["bbox"]
+        cells = tiled["cells"]
+    elif mode == "pyramid":
+        cells = pyramid_cells(pre_arr, post_arr, DEFAULT_CELL_SIZE)
+        pixels_changed = sum(c[2] for c in cells)
+        if cells:
+            boxes = np.array([c[3] for c in cells])
+            bbox = [int(boxes[:, 0].min()), int(boxes[:, 1].min()), int(boxes[:, 2].max()), int(boxes[:, 3].max())]
+        else:
+            bbox = None
+    else:
+        diff = _change_mask(pre_arr, post_arr, _pixel_words(pre_arr), _pixel_words(post_arr))
+        pixels_changed = int(np.count_nonzero(diff))
+
+        # bounding box of change
+        if pixels_changed > 0:
+            rows = np.flatnonzero(diff.any(axis=1))
+            cols = np.flatnonzero(diff.any(axis=0))
+            bbox = [int(cols[0]), int(rows[0]), int(cols[-1]), int(rows[-1])]
+            cells = cells_from_mask(diff, DEFAULT_CELL_SIZE)
+        else:
+            bbox = None
+            cells = []
 
-def _bbox_from_diff(diff_img: Image.Image) -> Optional[Tuple[int, int, int, int]]:
-    # PIL returns None if no change
-    return diff_img.getbbox()
+    return {
+        "pixels_total": int(pixels_total),
+        "pixels_changed": pixels_changed,
+        "percent_changed": float(pixels_changed / pixels_total),
+        "bbox": bbox,
+        **segment_regions(cells, pixels_total, max_regions),
+        **extra,
+    }
 
 
-def compute_delta(pre_path: Path, post_path: Path) -> Dict[str, Any]:
+def unchanged_delta(width: int, height: int, tile_size: int = None) -> Dict[str, Any]:
+    """
+    frame_delta's result for two identical width x height frames
+    (tile_size: both carried compatible tile maps of that size).
+    """
+    pixels_total = int(width) * int(height)
+    if pixels_total <= 0:
+        raise RuntimeError("Zero-sized frame")
+
+    extra = {}
+    if tile_size is not None:
+        extra = {"tile_size": tile_size, "tiles_changed": []}
+
+    return {
+        "pixels_total": pixels_total,
+        "pixels_changed": 0,
+        "percent_changed": 0.0,
+        "bbox": None,
+        **segment_regions([], pixels_total),
+        **extra,
+    }
+
+
+def compute_delta(pre, post, width: int = None, height: int = None) -> Dict[str, Any]:
     """
     Returns a dict suitable to place inside Delta.data
+    pre/post: arrays, snapshots, raw snapshot paths or image paths.
     Never raises — on failure, returns minimal diagnostic structure.
     """
 
     try:
-        pre = Image.open(pre_path).convert("L")   # grayscale
-        post = Image.open(post_path).convert("L")
-
-        if pre.size != post.size:
-            # Different shapes — treat as full-frame change
-            return {
-                "error": None,
-                "pre_checksum": _checksum(pre_path),
-                "post_checksum": _checksum(post_path),
-                "pixels_total": pre.size[0] * pre.size[1],
-                "pixels_changed": pre.size[0] * pre.size[1],
-                "percent_changed": 1.0,
-                "bbox": [0, 0, pre.size[0], pre.size[1]],
-            }
-
-        diff = ImageChops.difference(pre, post)
-        stat = ImageStat.Stat(diff)
-
-        # Count non-zero pixels
-        pixels_total = pre.size[0] * pre.size[1]
-        non_zero = sum(1 for p in diff.getdata() if p != 0)
-
-        bbox = _bbox_from_diff(diff)
+        pre_arr = load_frame(pre, width, height)
+        post_arr = load_frame(post, width, height)
+
+        measured = frame_delta(
+            pre_arr,
+            post_arr,
+            getattr(pre, "tiles", None),
+            getattr(post, "tiles", None),
+        )
 
         return {
             "error": None,
-            "pre_checksum": _checksum(pre_path),
-            "post_checksum": _checksum(post_path),
-            "pixels_total": pixels_total,
-            "pixels_changed": non_zero,
-            "percent_changed": non_zero / pixels_total if pixels_total else 0.0,
-            "bbox": list(bbox) if bbox else None,
+            "pre_checksum": getattr(pre, "checksum", None) or _checksum(pre_arr),
+            "post_checksum": getattr(post, "checksum", None) or _checksum(post_arr),
+            **measured,
         }
 
     except Exception as e:
@@ -80,4 +260,4 @@ def compute_delta(pre_path: Path, post_path: Path) -> Dict[str, Any]:
             "pixels_changed": None,
             "percent_changed": None,
             "bbox": None,
-  }
+        }
@@ -0,0 +1,204 @@
+"""
+FRAME CODEC — LOSSLESS INTER-FRAME COMPRESSION
+
+Encoded object = fixed header + compressed payload.
+
+Kinds:
+- keyframe: payload = compress(raw frame bytes)
+- xor:      payload = compress(raw frame XOR base frame), base named by checksum
+
+Rules:
+- Decoding is bit-exact; checksums are always over the decoded raw bytes
+- Chains are bounded by the keyframe interval
+- Frames of a different size than the base are always keyframes
+"""
+
+import lzma
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Dict, Any, Set
+
+import numpy as np
+
+
+MAGIC = b"EMEZ"
+VERSION = 1
+SUFFIX = ".emz"
+
+KIND_KEYFRAME = 0
+KIND_XOR = 1
+
+_COMPRESSORS = {"zlib": 0, "lzma": 1}
+_COMPRESSOR_NAMES = {v: k for k, v in _COMPRESSORS.items()}
+
+# magic, version, kind, compressor, reserved, width, height, raw length, base checksum
+_HEADER = struct.Struct("<4sBBBBIIQ64s")
+
+
+def _compress(data, compressor: str, level: int) -> bytes:
+    if compressor == "zlib":
+        return zlib.compress(data, level)
+    if compressor == "lzma":
+        return lzma.compress(data, preset=level)
+    raise ValueError(f"Unknown compressor: {compressor}")
+
+
+def _decompress(data: bytes, compressor: str) -> bytes:
+    if compressor == "zlib":
+        return zlib.decompress(data)
+    if compressor == "lzma":
+        return lzma.decompress(data)
+    raise ValueError(f"Unknown compressor: {compressor}")
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    dtype = np.uint32 if len(a) % 4 == 0 else np.uint8
+    return np.bitwise_xor(
+        np.frombuffer(a, dtype=dtype),
+        np.frombuffer(b, dtype=dtype),
+    ).tobytes()
+
+
+def encode_frame(
+    raw: bytes,
+    width: int,
+    height: int,
+    compressor: str = "zlib",
+    level: int = 1,
+    base: Optional[bytes] = None,
+    base_checksum: Optional[str] = None,
+) -> bytes:
+    if compressor not in _COMPRESSORS:
+        raise ValueError(f"Unknown compressor: {compressor}")
+
+    if base is not None and len(base) == len(raw):
+        kind = KIND_XOR
+        payload = _compress(_xor(raw, base), compressor, level)
+        base_field = base_checksum.encode("ascii")
+    else:
+        kind = KIND_KEYFRAME
+        payload = _compress(raw, compressor, level)
+        base_field = b""
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, kind, _COMPRESSORS[compressor], 0,
+        width, height, len(raw), base_field,
+    )
+    return header + payload
+
+
+def read_header(blob: bytes) -> Dict[str, Any]:
+    if len(blob) < _HEADER.size:
+        raise RuntimeError("Encoded frame truncated")
+
+    magic, version, kind, comp, _, width, height, raw_len, base = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise RuntimeError("Encoded frame magic mismatch")
+    if version != VERSION:
+        raise RuntimeError(f"Unsupported frame codec version: {version}")
+    if comp not in _COMPRESSOR_NAMES:
+        raise RuntimeError(f"Unknown frame compressor id: {comp}")
+
+    return {
+        "kind": kind,
+        "compressor": _COMPRESSOR_NAMES[comp],
+        "width": width,
+        "height": height,
+        "raw_length": raw_len,
+        "base_checksum": base.rstrip(b"\0").decode("ascii") or None,
+    }
+
+
+def read_header_file(path: Path) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        return read_header(f.read(_HEADER.size))
+
+
+def decode_frame(blob: bytes, load_base: Callable[[str], bytes]) -> bytes:
+    """
+    Decode an encoded object back to the exact raw frame bytes.
+    load_base(checksum) must return the decoded raw bytes of the base frame.
+    """
+    header = read_header(blob)
+    data = _decompress(blob[_HEADER.size:], header["compressor"])
+
+    if header["kind"] == KIND_XOR:
+        base = load_base(header["base_checksum"])
+        if len(base) != len(data):
+            raise RuntimeError("Encoded frame base size mismatch")
+        data = _xor(data, base)
+    elif header["kind"] != KIND_KEYFRAME:
+        raise RuntimeError(f"Unknown encoded frame kind: {header['kind']}")
+
+    if len(data) != header["raw_length"]:
+        raise RuntimeError(
+            f"Decoded frame size mismatch: expected {header['raw_length']} bytes, got {len(data)}"
+        )
+    return data
+
+
+class FrameCodec:
+    """
+    Stateful encoder: each frame is encoded against the previous one,
+    with a keyframe every `keyframe_interval` frames.
+    """
+
+    RECENT_FRAMES = 16
+
+    def __init__(self, compressor: str = "zlib", level: int = 1, keyframe_interval: int = 30):
+        if compressor not in _COMPRESSORS:
+            raise ValueError(f"Unknown compressor: {compressor}")
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be >= 1")
+
+        self._compressor = compressor
+        self._level = level
+        self._interval = keyframe_interval
+
+        # (checksum, raw bytes, chain position) of the last encoded frame
+        self._last = None
+
+        # checksum → raw bytes of recently planned frames, so bases still
+        # in flight on a writer thread never need a disk read
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+
+    def plan(self, checksum: str, raw: bytes, width: int, height: int) -> Callable[[], bytes]:
+        """
+        Fix this frame's base now (capture order) and return a callable
+        that performs the actual compression, so it can run off-thread.
+        """
+        with self._lock:
+            last = self._last
+            if last is not None and last[2] + 1 < self._interval and len(last[1]) == len(raw):
+                base_checksum, base, position = last[0], last[1], last[2] + 1
+            else:
+                base_checksum, base, position = None, None, 0
+
+            self._last = (checksum, raw, position)
+            self._recent[checksum] = raw
+            while len(self._recent) > self.RECENT_FRAMES:
+                self._recent.popitem(last=False)
+
+        compressor, level = self._compressor, self._level
+
+        def encode() -> bytes:
+            return encode_frame(raw, width, height, compressor, level, base, base_checksum)
+
+        return encode
+
+    def recent(self, checksum: str) -> Optional[bytes]:
+        """Raw bytes of a recently planned frame with this checksum, if any."""
+        with self._lock:
+            return self._recent.get(checksum)
+
+    def pinned(self) -> Set[str]:
+        """Checksums future frames may still be encoded against (must stay stored)."""
+        with self._lock:
+            pinned = set(self._recent)
+            if self._last is not None:
+                pinned.add(self._last[0])
+            return pinned
@@ -0,0 +1,118 @@
+"""
+Change regions.
+
+Groups changed pixels into clustered regions:
+- the frame is cut into fixed DEFAULT_CELL_SIZE cells, whichever
+  delta path (full, pyramid, tiles of any size) measured it
+- changed cells that touch (8-neighbourhood) form one region
+- each region reports its exact pixel count and inclusive bbox
+
+Bounded output: only the largest `max_regions` regions are kept.
+No semantics. Pure measurement.
+"""
+
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+
+DEFAULT_CELL_SIZE = 64
+DEFAULT_MAX_REGIONS = 16
+
+# (cell_y, cell_x, pixels_changed, [x0, y0, x1, y1])
+Cell = Tuple[int, int, int, List[int]]
+
+
+def cells_from_mask(mask: np.ndarray, cell: int = DEFAULT_CELL_SIZE) -> List[Cell]:
+    """Per-cell change statistics for a boolean (H, W) change mask."""
+    h, w = mask.shape
+    rows = -(-h // cell)
+    cols = -(-w // cell)
+
+    if rows * cell != h or cols * cell != w:
+        padded = np.zeros((rows * cell, cols * cell), dtype=bool)
+        padded[:h, :w] = mask
+        mask = padded
+
+    blocks = mask.reshape(rows, cell, cols, cell)
+    counts = np.count_nonzero(blocks, axis=(1, 3))
+    changed = np.argwhere(counts)
+    if len(changed) == 0:
+        return []
+
+    # per-cell row / column occupancy → first and last index inside the cell
+    row_any = blocks.any(axis=3)                    # (rows, cell, cols)
+    col_any = blocks.any(axis=1)                    # (rows, cols, cell)
+
+    cy, cx = changed[:, 0], changed[:, 1]
+    r_occ = row_any[cy, :, cx]                      # (n, cell)
+    c_occ = col_any[cy, cx, :]                      # (n, cell)
+
+    y0 = r_occ.argmax(axis=1)
+    y1 = cell - 1 - r_occ[:, ::-1].argmax(axis=1)
+    x0 = c_occ.argmax(axis=1)
+    x1 = cell - 1 - c_occ[:, ::-1].argmax(axis=1)
+
+    cells = []
+    for i in range(len(changed)):
+        by, bx = int(cy[i]) * cell, int(cx[i]) * cell
+        cells.append((
+            int(cy[i]),
+            int(cx[i]),
+            int(counts[cy[i], cx[i]]),
+            [bx + int(x0[i]), by + int(y0[i]), bx + int(x1[i]), by + int(y1[i])],
+        ))
+    return cells
+
+
+def segment_regions(
+    cells: List[Cell],
+    pixels_total: int,
+    max_regions: int = DEFAULT_MAX_REGIONS,
+) -> Dict[str, Any]:
+    """
+    Connected components over changed cells.
+    Returns {"regions": [...], "regions_truncated": bool}, largest first.
+    """
+    by_pos = {(c[0], c[1]): c for c in cells if c[2] > 0}
+    seen = set()
+    regions = []
+
+    for start in by_pos:
+        if start in seen:
+            continue
+
+        seen.add(start)
+        stack = [start]
+        count = 0
+        x0 = y0 = None
+        x1 = y1 = None
+
+        while stack:
+            cy, cx = stack.pop()
+            _, _, n, (bx0, by0, bx1, by1) = by_pos[(cy, cx)]
+            count += n
+            x0 = bx0 if x0 is None else min(x0, bx0)
+            y0 = by0 if y0 is None else min(y0, by0)
+            x1 = bx1 if x1 is None else max(x1, bx1)
+            y1 = by1 if y1 is None else max(y1, by1)
+
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    nb = (cy + dy, cx + dx)
+                    if nb in by_pos and nb not in seen:
+                        seen.add(nb)
+                        stack.append(nb)
+
+        regions.append({
+            "bbox": [x0, y0, x1, y1],
+            "pixels_changed": count,
+            "percent_changed": float(count / pixels_total) if pixels_total else 0.0,
+        })
+
+    regions.sort(key=lambda r: (-r["pixels_changed"], r["bbox"]))
+
+    return {
+        "regions": regions[:max_regions],
+        "regions_truncated": len(regions) > max_regions,
+    }
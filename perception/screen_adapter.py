@@ -6,9 +6,12 @@ Truth boundary. Pixel-in → Evidence-out.
 Hard guarantees:
 - Exact framebuffer bytes preserved
 - No transformations (no resize, encode, convert, normalize)
-- Cryptographic integrity verification
+  (a store codec is lossless; decoded bytes are bit-exact)
+- Integrity verification (full / deferred / sampled policy)
 - Atomic persistence or crash
 - Deterministic behavior
+- Per-monitor mode: each physical monitor is its own frame, grabbed,
+  hashed and persisted concurrently (same guarantees per frame)
 
 If anything smells wrong → crash.
 """
@@ -18,11 +21,20 @@ import time
 import json
 import hashlib
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List
 
 import mss
 import numpy as np
 
+from core import metrics, tracing
+from perception.snapshot_writer import SnapshotWriter
+from perception.snapshot_store import SnapshotStore, read_frame_bytes
+from perception.tiles import TileMap, TileMapCache, compute_tile_map
+from perception.scrubber import SnapshotScrubber
+
 
 SNAPSHOT_DIR = Path("snapshots")
 SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
@@ -34,6 +46,19 @@ def _sha256_bytes(buf: bytes) -> str:
     return h.hexdigest()
 
 
+def _blake2b_bytes(buf: bytes) -> str:
+    return hashlib.blake2b(buf, digest_size=16).hexdigest()
+
+
+# content hash name → function; the name is recorded with every snapshot
+HASH_ALGORITHMS = {
+    "sha256": _sha256_bytes,
+    "blake2b": _blake2b_bytes,
+}
+
+VERIFY_POLICIES = ("full", "deferred", "sampled")
+
+
 def _atomic_write(path: Path, data: bytes) -> None:
     # Write to temp file → fsync → atomic rename
     try:
@@ -61,14 +86,87 @@ def _atomic_write(path: Path, data: bytes) -> None:
         raise RuntimeError(f"Atomic write failure: {e}")
 
 
+def _rehash_persisted(path: Path, checksum: str, store: SnapshotStore = None, algorithm: str = "sha256") -> str:
+    if store is not None:
+        persisted = store.read_persisted(checksum)
+    else:
+        persisted = read_frame_bytes(path)
+    return HASH_ALGORITHMS[algorithm](persisted)
+
+
+def _verify_persisted(path: Path, checksum: str, store: SnapshotStore = None, algorithm: str = "sha256") -> None:
+    # Re-read → re-hash to guarantee fidelity after persistence
+    if _rehash_persisted(path, checksum, store, algorithm) != checksum:
+        metrics.CHECKSUM_MISMATCHES.inc()
+        raise RuntimeError("Post-persist checksum mismatch — storage corruption suspected")
+
+
+def resolve_region(screen: dict, region) -> dict:
+    """mss monitor dict for region (left, top, width, height); None → screen."""
+    if region is None:
+        return screen
+
+    if isinstance(region, dict):
+        left, top, width, height = (region[k] for k in ("left", "top", "width", "height"))
+    else:
+        left, top, width, height = region
+    left, top, width, height = int(left), int(top), int(width), int(height)
+
+    if width <= 0 or height <= 0:
+        raise RuntimeError(f"Region invariant violated: empty region {width}x{height}")
+
+    if (
+        left < screen["left"]
+        or top < screen["top"]
+        or left + width > screen["left"] + screen["width"]
+        or top + height > screen["top"] + screen["height"]
+    ):
+        raise RuntimeError(f"Region invariant violated: {[left, top, width, height]} outside screen")
+
+    return {"left": left, "top": top, "width": width, "height": height}
+
+
+def _crop(np_frame: np.ndarray, screen: dict, monitor: dict) -> np.ndarray:
+    """View of monitor's rectangle within a frame covering screen."""
+    x, y = monitor["left"] - screen["left"], monitor["top"] - screen["top"]
+    # view only; _freeze copies the bytes before the backend can reuse its buffer
+    return np_frame[y:y + monitor["height"], x:x + monitor["width"]]
+
+
+def check_frame(np_frame: np.ndarray, monitor: dict) -> None:
+    # Invariant enforcement
+    if np_frame.ndim != 3:
+        raise RuntimeError(f"Frame invariant violated: ndim={np_frame.ndim}")
+
+    h, w, c = np_frame.shape
+    if c != 4:
+        raise RuntimeError(f"Color channel invariant violated: expected BGRA(4), got {c}")
+
+    if (w, h) != (monitor["width"], monitor["height"]):
+        raise RuntimeError(
+            f"Frame invariant violated: got {w}x{h}, requested {monitor['width']}x{monitor['height']}"
+        )
+
+
 class ScreenSnapshot:
     """
     Immutable factual snapshot. No mutation allowed.
+
+    `frame` optionally holds the captured pixel array (read-only) so
+    consumers can skip re-reading the persisted file. It is never
+    serialized; snapshots rebuilt from a path alone carry frame=None.
+    `tiles` optionally holds the frame's TileMap (also never serialized).
+    `region` is the captured rectangle [left, top, width, height] in
+    virtual-screen coordinates (None when unknown).
+    `hash_algorithm` names the content hash that produced `checksum`.
     """
 
-    __slots__ = ("path", "timestamp_monotonic", "timestamp_wall", "width", "height", "checksum")
+    __slots__ = ("path", "timestamp_monotonic", "timestamp_wall", "width", "height", "checksum", "frame", "tiles",
+                 "region", "hash_algorithm", "write_seq")
 
-    def __init__(self, path: Path, tmono: float, twall: float, width: int, height: int, checksum: str):
+    def __init__(self, path: Path, tmono: float, twall: float, width: int, height: int, checksum: str,
+                 frame: np.ndarray = None, tiles: TileMap = None, region=None, hash_algorithm: str = "sha256",
+                 write_seq: int = None):
         self.path = str(path)
         self.timestamp_monotonic = float(tmono)
         self.timestamp_wall = float(twall)
@@ -76,6 +174,18 @@ class ScreenSnapshot:
         self.height = int(height)
         self.checksum = str(checksum)
 
+        if frame is not None:
+            if frame.shape != (self.height, self.width, 4):
+                raise RuntimeError(
+                    f"Snapshot frame shape mismatch: {frame.shape} vs {(self.height, self.width, 4)}"
+                )
+            frame.flags.writeable = False
+        self.frame = frame
+        self.tiles = tiles
+        self.region = [int(v) for v in region] if region is not None else None
+        self.hash_algorithm = str(hash_algorithm)
+        self.write_seq = write_seq
+
     def to_dict(self):
         return {
             "path": self.path,
@@ -84,61 +194,267 @@ class ScreenSnapshot:
             "width": self.width,
             "height": self.height,
             "checksum": self.checksum,
+            "region": self.region,
+            "hash_algorithm": self.hash_algorithm,
         }
 
 
 class ScreenAdapter:
     """
     Deterministic screen capture boundary.
+
+    With a SnapshotWriter, persistence and verification run in the
+    background: the returned snapshot's path is only guaranteed durable
+    after flush() (or flush([snapshot])) returns.
+
+    With a SnapshotStore, frames are content-addressed and a frame whose
+    checksum is already stored is not written again.
+
+    With tile_size, every snapshot carries tile digests for incremental
+    deltas; digests are cached by checksum across captures.
+
+    verify selects when persisted frames are re-read and re-hashed:
+      full      every frame, before it counts as persisted (default)
+      sampled   every `sample_every`-th persisted frame, same way
+      deferred  every frame, later, by a SnapshotScrubber (mismatches logged)
+    hash_algorithm: "sha256" (default) or "blake2b" (128-bit digest). Which
+    is faster depends on the CPU (SHA-256 is hardware-accelerated on many);
+    the benchmark runner times both (hash_* stages).
+
+    source: any mss-compatible grabber (`monitors`, `grab(monitor)`);
+    defaults to a new mss session. snapshot_dir: flat-mode directory.
+    backend: an OSBackend; frames come from backend.capture_screen()
+    instead of mss (a region is cut from the full frame).
+
+    capture_monitors() grabs every physical monitor as its own snapshot,
+    one worker thread per monitor. The default mss source gets one session
+    per worker thread; a given source or backend is grabbed under a lock
+    (or once, and cut per monitor), then hashed and persisted in parallel.
     """
 
-    def __init__(self):
-        self._sct = mss.mss()
+    def __init__(self, writer: SnapshotWriter = None, store: SnapshotStore = None, tile_size: int = None,
+                 verify: str = "full", sample_every: int = 16, hash_algorithm: str = "sha256",
+                 scrubber: SnapshotScrubber = None, source=None, snapshot_dir: Path = SNAPSHOT_DIR,
+                 backend=None):
+        if verify not in VERIFY_POLICIES:
+            raise ValueError(f"verify must be one of {VERIFY_POLICIES}")
+        if hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"hash_algorithm must be one of {tuple(HASH_ALGORITHMS)}")
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        if backend is not None and source is not None:
+            raise ValueError("pass either source or backend, not both")
+
+        self._backend = backend
+        self._sct = None
+        if backend is None:
+            self._sct = source if source is not None else mss.mss()
+        self._own_sct = backend is None and source is None
+        self._local = threading.local()
+        self._grab_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._snapshot_dir = Path(snapshot_dir)
+        self._writer = writer
+        self._store = store
+        self._tile_size = tile_size
+        self._tile_cache = TileMapCache()
+
+        self._verify = verify
+        self._sample_every = sample_every
+        self._persisted = 0
+        self._hash_algorithm = hash_algorithm
+        self._hash = HASH_ALGORITHMS[hash_algorithm]
+        if verify == "deferred" and scrubber is None:
+            scrubber = SnapshotScrubber()
+        self._scrubber = scrubber
+
+    @property
+    def store(self):
+        return self._store
+
+    def flush(self, snapshots=None) -> None:
+        """
+        Durability barrier for the given snapshots, or for every snapshot
+        captured so far. Frames captured later are not waited on.
+        """
+        if self._writer is None:
+            return
+        if snapshots is None:
+            self._writer.flush()
+            return
+
+        seqs = [s.write_seq for s in snapshots if s.write_seq is not None]
+        if seqs:
+            self._writer.flush(upto=max(seqs))
+
+    def capture(self, region=None) -> ScreenSnapshot:
+        """
+        region: optional (left, top, width, height) in virtual-screen
+        coordinates; only that rectangle is grabbed, hashed and persisted.
+        """
+        t0 = time.perf_counter()
+        try:
+            if self._backend is None:
+                monitor = resolve_region(self._sct.monitors[0], region)
+
+                t_before = time.perf_counter()
+
+                with tracing.span("capture.grab"):
+                    frame = self._sct.grab(monitor)
 
-    def capture(self) -> ScreenSnapshot:
+                # Convert to numpy without modification
+                np_frame = np.asarray(frame, dtype=np.uint8)
+            else:
+                t_before = time.perf_counter()
+                np_frame, monitor = self._grab_backend(region)
+
+            check_frame(np_frame, monitor)
+
+            snap = self._freeze(np_frame, monitor, t_before)
+        except Exception:
+            metrics.CAPTURE_FAILURES.inc()
+            raise
+
+        metrics.CAPTURE_SECONDS.observe(time.perf_counter() - t0)
+        return snap
+
+    def capture_monitors(self) -> List[ScreenSnapshot]:
+        """
+        One snapshot per physical monitor, in monitor order; each region
+        is that monitor's rectangle in virtual-screen coordinates.
+        """
+        t0 = time.perf_counter()
+        try:
+            if self._backend is None:
+                monitors = [dict(m) for m in (self._sct.monitors[1:] or self._sct.monitors[:1])]
+                snaps = tracing.pool_map(self._workers(len(monitors)), self._capture_monitor, monitors)
+            else:
+                t_before = time.perf_counter()
+                np_frame, screen = self._backend_frame()
+                monitors = [resolve_region(screen, m) for m in (getattr(self._backend, "monitors", None) or [screen])]
+                snaps = tracing.pool_map(
+                    self._workers(len(monitors)),
+                    lambda m: self._freeze(_crop(np_frame, screen, m), m, t_before),
+                    monitors,
+                )
+        except Exception:
+            metrics.CAPTURE_FAILURES.inc()
+            raise
+
+        metrics.CAPTURE_SECONDS.observe(time.perf_counter() - t0)
+        return snaps
+
+    def _workers(self, n: int) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(1, n), thread_name_prefix="monitor-capture")
+            return self._pool
+
+    def _capture_monitor(self, monitor: dict) -> ScreenSnapshot:
         t_before = time.perf_counter()
 
-        frame = self._sct.grab(self._sct.monitors[0])
+        with tracing.span("capture.grab"):
+            if self._own_sct:
+                # mss sessions are thread-bound: one per worker thread
+                sct = getattr(self._local, "sct", None)
+                if sct is None:
+                    sct = self._local.sct = mss.mss()
+                frame = sct.grab(monitor)
+            else:
+                with self._grab_lock:
+                    frame = self._sct.grab(monitor)
 
-        # Convert to numpy without modification
         np_frame = np.asarray(frame, dtype=np.uint8)
+        check_frame(np_frame, monitor)
 
-        # Invariant enforcement
-        if np_frame.ndim != 3:
-            raise RuntimeError(f"Frame invariant violated: ndim={np_frame.ndim}")
+        return self._freeze(np_frame, monitor, t_before)
 
-        h, w, c = np_frame.shape
-        if c != 4:
-            raise RuntimeError(f"Color channel invariant violated: expected BGRA(4), got {c}")
+    def _grab_backend(self, region):
+        np_frame, screen = self._backend_frame()
+        monitor = resolve_region(screen, region)
+        return _crop(np_frame, screen, monitor), monitor
 
-        # Freeze the raw bytes exactly as captured
-        raw_bytes = np_frame.tobytes()
+    def _backend_frame(self):
+        with tracing.span("capture.grab"):
+            frame, _, meta = self._backend.capture_screen()
 
-        # First checksum
-        checksum = _sha256_bytes(raw_bytes)
+        np_frame = np.asarray(frame, dtype=np.uint8)
+        screen = {
+            "left": int(meta.get("left", 0)),
+            "top": int(meta.get("top", 0)),
+            "width": int(meta.get("width", np_frame.shape[1])),
+            "height": int(meta.get("height", np_frame.shape[0])),
+        }
+        check_frame(np_frame, screen)
+        return np_frame, screen
+
+    def persist_frame(self, np_frame: np.ndarray, tmono: float, twall: float, region) -> ScreenSnapshot:
+        """
+        Persist a frame captured elsewhere (e.g. a CaptureRing) under the
+        same invariants, keeping its original capture timestamps.
+        """
+        try:
+            left, top, width, height = (int(v) for v in region)
+            monitor = {"left": left, "top": top, "width": width, "height": height}
 
-        t_after = time.perf_counter()
-        t_wall = time.time()
+            check_frame(np_frame, monitor)
 
-        # Filename embeds time + checksum prefix
-        fname = f"{int(t_wall * 1000)}_{checksum[:16]}.bin"
-        target = SNAPSHOT_DIR / fname
+            return self._freeze(np_frame, monitor, None, tmono, twall)
+        except Exception:
+            metrics.CAPTURE_FAILURES.inc()
+            raise
 
-        _atomic_write(target, raw_bytes)
+    def _freeze(self, np_frame: np.ndarray, monitor: dict, t_before: float = None,
+                tmono: float = None, twall: float = None) -> ScreenSnapshot:
+        h, w = np_frame.shape[:2]
 
-        # Re-read → re-hash to guarantee fidelity after persistence
-        with open(target, "rb") as f:
-            persisted = f.read()
+        # Freeze the raw bytes exactly as captured
+        with tracing.span("capture.freeze"):
+            raw_bytes = np_frame.tobytes()
 
-        persisted_hash = _sha256_bytes(persisted)
+        # In-memory view over the frozen bytes (no copy, read-only)
+        frozen = np.frombuffer(raw_bytes, dtype=np.uint8).reshape((h, w, 4))
 
-        if persisted_hash != checksum:
-            raise RuntimeError("Post-persist checksum mismatch — storage corruption suspected")
+        # First checksum
+        with tracing.span("capture.hash"):
+            checksum = self._hash(raw_bytes)
+
+        if tmono is None:
+            t_after = time.perf_counter()
+            t_wall = time.time()
+        else:
+            t_after = tmono
+            t_wall = twall
+
+        if self._store is None:
+            # Filename embeds time + checksum prefix
+            fname = f"{int(t_wall * 1000)}_{checksum[:16]}.bin"
+            target = self._snapshot_dir / fname
+            self._persist(target, raw_bytes, checksum, w, h)
+        else:
+            target, must_write = self._store.claim(checksum)
+            if must_write:
+                self._persist(target, raw_bytes, checksum, w, h)
+
+        # covers this frame's write, or the earlier one it was deduplicated against
+        write_seq = self._writer.last_seq if self._writer is not None else None
 
         # Monotonic ordering invariant
-        if t_after < t_before:
+        if t_before is not None and t_after < t_before:
             raise RuntimeError("Monotonic clock violation")
 
+        tiles = None
+        if self._tile_size is not None:
+            key = (checksum, w, h, self._tile_size)
+            with self._lock:
+                tiles = self._tile_cache.get(key)
+            if tiles is None:
+                with tracing.span("capture.tiles"):
+                    tiles = compute_tile_map(frozen, self._tile_size)
+                with self._lock:
+                    self._tile_cache.put(key, tiles)
+
         return ScreenSnapshot(
             path=target,
             tmono=t_after,
@@ -146,8 +462,74 @@ class ScreenAdapter:
             width=w,
             height=h,
             checksum=checksum,
+            frame=frozen,
+            tiles=tiles,
+            region=[monitor["left"], monitor["top"], w, h],
+            hash_algorithm=self._hash_algorithm,
+            write_seq=write_seq,
         )
 
+    def _persist(self, target: Path, raw_bytes: bytes, checksum: str, w: int, h: int) -> None:
+        payload = raw_bytes
+        if self._store is not None:
+            payload = self._store.prepare(checksum, raw_bytes, w, h)
+
+        check = self._verification_for_next_frame()
+
+        if self._writer is None:
+            t0 = time.perf_counter()
+            try:
+                data = payload() if callable(payload) else payload
+                with tracing.span("capture.write"):
+                    _atomic_write(target, data)
+                self._verify_frame(target, checksum, check)
+            finally:
+                self._release(checksum)
+            metrics.PERSIST_SECONDS.observe(time.perf_counter() - t0)
+            metrics.BYTES_WRITTEN.observe(len(data))
+        else:
+            # may block on a full queue (backpressure)
+            with tracing.span("capture.submit"):
+                self._writer.submit(
+                    target,
+                    payload,
+                    on_durable=lambda p, c=checksum, v=check: self._on_durable(p, c, v),
+                )
+
+    def _verification_for_next_frame(self) -> str:
+        """"now", "defer" or "skip" for the frame about to be persisted."""
+        with self._lock:
+            n = self._persisted
+            self._persisted += 1
+
+        if self._verify == "full":
+            return "now"
+        if self._verify == "deferred":
+            return "defer"
+        return "now" if n % self._sample_every == 0 else "skip"
+
+    def _verify_frame(self, path: Path, checksum: str, check: str) -> None:
+        if check == "now":
+            with tracing.span("capture.verify"):
+                _verify_persisted(path, checksum, self._store, self._hash_algorithm)
+        elif check == "defer":
+            store, algorithm = self._store, self._hash_algorithm
+            self._scrubber.submit(
+                path,
+                checksum,
+                lambda p: _rehash_persisted(p, checksum, store, algorithm),
+            )
+
+    def _on_durable(self, path: Path, checksum: str, check: str) -> None:
+        try:
+            self._verify_frame(path, checksum, check)
+        finally:
+            self._release(checksum)
+
+    def _release(self, checksum: str) -> None:
+        if self._store is not None:
+            self._store.release(checksum)
+
 
 # Optional manual check
 if __name__ == "__main__":
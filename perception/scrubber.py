@@ -0,0 +1,88 @@
+"""
+SNAPSHOT SCRUBBER — DEFERRED INTEGRITY VERIFICATION
+
+Re-reads persisted frames off the critical path and re-hashes them.
+
+Rules:
+- A mismatch is never silent: it goes to crashes.log and events.log
+- The scrubber never raises into the capture path
+- A full queue is logged as skipped verification, never blocks capture
+"""
+
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, List
+
+from core import metrics
+from core.logger import log_crash, log_event
+
+
+_STOP = object()
+
+
+class SnapshotScrubber:
+    """
+    Background verifier. verify(path) must return the persisted frame's
+    checksum (recomputed from storage).
+    """
+
+    def __init__(self, max_pending: int = 1024):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self.verified = 0
+        self.skipped = 0
+        self.mismatches: List[str] = []
+
+        self._done = threading.Condition(self._lock)
+        self._outstanding = 0
+
+        self._thread = threading.Thread(target=self._run, name="snapshot-scrubber", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Path, checksum: str, rehash: Callable[[Path], str]) -> None:
+        with self._lock:
+            self._outstanding += 1
+        try:
+            self._queue.put_nowait((Path(path), checksum, rehash))
+        except queue.Full:
+            with self._lock:
+                self._outstanding -= 1
+                self.skipped += 1
+                self._done.notify_all()
+            log_event(f"snapshot.scrub_skipped {path}")
+
+    def drain(self, timeout: float = None) -> bool:
+        """Wait until every queued frame has been checked."""
+        with self._lock:
+            return self._done.wait_for(lambda: self._outstanding == 0, timeout=timeout)
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            path, checksum, rehash = item
+            try:
+                ok = rehash(path) == checksum
+                reason = "checksum_mismatch"
+            except Exception as e:
+                ok = False
+                reason = f"unreadable ({e})"
+
+            if not ok:
+                metrics.CHECKSUM_MISMATCHES.inc()
+                log_crash(f"SNAPSHOT CORRUPTION: {path} {reason}")
+                log_event(f"snapshot.checksum_mismatch {path}")
+
+            with self._lock:
+                self.verified += 1
+                if not ok:
+                    self.mismatches.append(str(path))
+                self._outstanding -= 1
+                self._done.notify_all()
@@ -0,0 +1,80 @@
+"""
+Snapshot reader.
+
+Read-only access to persisted raw frames without loading them:
+- raw .bin files are memory-mapped; only touched pages are read
+- size is validated against snapshot metadata before mapping
+- encoded (.emz) objects cannot be mapped and are decoded once
+
+No copies unless the caller makes one.
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from perception import frame_codec
+from perception.snapshot_store import read_frame_bytes
+
+
+class SnapshotReader:
+    """
+    Read-only (H, W, 4) view of one persisted frame.
+    """
+
+    def __init__(self, path, width: int, height: int):
+        self.path = Path(path)
+        self.width = int(width)
+        self.height = int(height)
+
+        expected = self.width * self.height * 4
+        if expected <= 0:
+            raise RuntimeError("Zero-sized frame")
+
+        if self.path.suffix == frame_codec.SUFFIX:
+            raw = read_frame_bytes(self.path)
+            if len(raw) != expected:
+                raise RuntimeError(
+                    f"Frame size mismatch: expected {expected} bytes, got {len(raw)}"
+                )
+            arr = np.frombuffer(raw, dtype=np.uint8)
+        else:
+            size = os.stat(self.path).st_size
+            if size != expected:
+                raise RuntimeError(
+                    f"Frame size mismatch: expected {expected} bytes, got {size}"
+                )
+            arr = np.memmap(self.path, dtype=np.uint8, mode="r", shape=(expected,))
+
+        self._frame = arr.reshape((self.height, self.width, 4))
+
+    @classmethod
+    def open(cls, snapshot: Any) -> "SnapshotReader":
+        """From a ScreenSnapshot or a logged snapshot dict (path/width/height)."""
+        if isinstance(snapshot, dict):
+            return cls(snapshot["path"], snapshot["width"], snapshot["height"])
+        return cls(snapshot.path, snapshot.width, snapshot.height)
+
+    def frame(self) -> np.ndarray:
+        return self._frame
+
+    def region(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """View of a rectangle in frame coordinates; only its rows are paged in."""
+        if (
+            left < 0 or top < 0 or width <= 0 or height <= 0
+            or left + width > self.width or top + height > self.height
+        ):
+            raise RuntimeError(f"Region outside frame: {[left, top, width, height]}")
+        return self._frame[top:top + height, left:left + width]
+
+    def close(self) -> None:
+        """Drop this reader's mapping; views handed out stay valid."""
+        self._frame = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,375 @@
+"""
+SNAPSHOT STORE — CONTENT-ADDRESSED FRAMES
+
+Layout:
+  <root>/objects/ab/cd/<full checksum>.bin   one file per distinct frame
+                                             (.emz when a FrameCodec is set)
+  <root>/index.jsonl                         experiment → frame checksums
+  <root>/layout.json                         fan-out parameters
+
+Rules:
+- A frame is identified by its full checksum, stored exactly once
+- Objects are immutable; re-referencing a frame only refreshes its mtime
+- Retention (gc) removes least-recently-referenced objects first,
+  but never an object still needed to decode a retained one, nor a
+  base the codec may still encode new frames against
+- Post-persist verification decodes against bases on disk; a base only
+  in memory counts solely while it is still being written
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Callable, Union
+
+from perception import frame_codec
+from perception.frame_codec import FrameCodec
+
+
+STORE_DIR = Path("snapshots") / "store"
+
+RAW_SUFFIX = ".bin"
+_SUFFIXES = (RAW_SUFFIX, frame_codec.SUFFIX)
+
+
+class _DecodedCache:
+    """
+    LRU of decoded codec frames by checksum, bounded in bytes. Objects are
+    immutable and content-addressed, so an entry can never go stale; it
+    turns chain decodes of consecutive frames into one XOR each.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._frames = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, checksum: str) -> Optional[bytes]:
+        with self._lock:
+            raw = self._frames.get(checksum)
+            if raw is not None:
+                self._frames.move_to_end(checksum)
+            return raw
+
+    def put(self, checksum: str, raw: bytes) -> None:
+        if len(raw) > self._max_bytes:
+            return
+        with self._lock:
+            if checksum in self._frames:
+                return
+            self._frames[checksum] = raw
+            self._bytes += len(raw)
+            while self._bytes > self._max_bytes:
+                _, old = self._frames.popitem(last=False)
+                self._bytes -= len(old)
+
+
+_decoded = _DecodedCache(128 << 20)
+
+
+def _read_file(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_frame_bytes(path) -> bytes:
+    """
+    Raw frame bytes for any snapshot path: flat/raw files are returned as
+    stored, codec objects are decoded through the store that owns them.
+    """
+    path = Path(path)
+    if path.suffix != frame_codec.SUFFIX:
+        return _read_file(path)
+
+    for parent in path.parents:
+        if parent.name == "objects":
+            return _reader(parent.parent).read(path.stem)
+
+    raise RuntimeError(f"Encoded snapshot outside a snapshot store: {path}")
+
+
+_readers = {}
+_readers_lock = threading.Lock()
+
+
+def _reader(root: Path) -> "SnapshotStore":
+    """One store per root for read_frame_bytes, opened without creating anything."""
+    with _readers_lock:
+        store = _readers.get(root)
+        if store is None:
+            store = _readers[root] = SnapshotStore(root, create=False)
+        return store
+
+
+class SnapshotStore:
+    """
+    Deduplicating frame store with fan-out directories and retention.
+    create=False opens an existing store only: nothing is written on open.
+    """
+
+    def __init__(self, root: Path = STORE_DIR, fanout: int = 2, levels: int = 2, codec: FrameCodec = None,
+                 create: bool = True):
+        if fanout < 1 or levels < 0:
+            raise ValueError("fanout must be >= 1 and levels >= 0")
+
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.jsonl"
+        self._fanout, self._levels = self._load_layout(fanout, levels, create)
+        self._codec = codec
+        self._suffix = frame_codec.SUFFIX if codec is not None else RAW_SUFFIX
+
+        self._lock = threading.Lock()
+        self._pending = {}
+
+        if create:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    def _load_layout(self, fanout: int, levels: int, create: bool) -> Tuple[int, int]:
+        layout_path = self.root / "layout.json"
+        try:
+            with open(layout_path, "r", encoding="utf-8") as f:
+                layout = json.load(f)
+            return int(layout["fanout"]), int(layout["levels"])
+        except FileNotFoundError:
+            if not create:
+                raise RuntimeError(f"Not a snapshot store: {self.root}")
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = layout_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fanout": fanout, "levels": levels}, f)
+        tmp.replace(layout_path)
+        return fanout, levels
+
+    def object_path(self, checksum: str, suffix: str = None) -> Path:
+        parts = [
+            checksum[i * self._fanout:(i + 1) * self._fanout]
+            for i in range(self._levels)
+        ]
+        return self.objects_dir.joinpath(*parts, f"{checksum}{suffix or self._suffix}")
+
+    def locate(self, checksum: str) -> Optional[Path]:
+        for suffix in _SUFFIXES:
+            path = self.object_path(checksum, suffix)
+            if path.exists():
+                return path
+        return None
+
+    def claim(self, checksum: str) -> Tuple[Path, bool]:
+        """
+        (path, must_write) for a frame with this checksum.
+        must_write is False if it is already stored (mtime refreshed) or
+        being written. A True claim must be followed by release() once durable.
+        """
+        with self._lock:
+            if checksum in self._pending:
+                return self._pending[checksum], False
+
+            for suffix in _SUFFIXES:
+                path = self.object_path(checksum, suffix)
+                try:
+                    os.utime(path)
+                    return path, False
+                except FileNotFoundError:
+                    pass
+
+            path = self.object_path(checksum)
+            self._pending[checksum] = path
+            return path, True
+
+    def release(self, checksum: str) -> None:
+        with self._lock:
+            self._pending.pop(checksum, None)
+
+    # ---- frame bytes ----
+
+    def prepare(self, checksum: str, raw: bytes, width: int, height: int) -> Union[bytes, Callable[[], bytes]]:
+        """
+        Payload for a claimed frame: raw bytes, or a deferred encoder when
+        a codec is configured (its base is fixed now, in capture order).
+        """
+        if self._codec is None:
+            return raw
+        return self._codec.plan(checksum, raw, width, height)
+
+    def read(self, checksum: str) -> bytes:
+        """Exact raw frame bytes for a stored checksum (decoded if needed)."""
+        if self._codec is not None:
+            recent = self._codec.recent(checksum)
+            if recent is not None and self.locate(checksum) is None:
+                return recent
+
+        path = self.locate(checksum)
+        if path is None:
+            raise RuntimeError(f"Snapshot object missing: {checksum}")
+
+        if path.suffix == RAW_SUFFIX:
+            return _read_file(path)
+
+        raw = _decoded.get(checksum)
+        if raw is None:
+            raw = frame_codec.decode_frame(_read_file(path), self._read_base)
+            _decoded.put(checksum, raw)
+        return raw
+
+    def read_persisted(self, checksum: str) -> bytes:
+        """
+        read() for verification: the object comes from disk, and its base
+        must be on disk too (or claimed and still being written).
+        """
+        path = self.locate(checksum)
+        if path is None:
+            raise RuntimeError(f"Snapshot object missing: {checksum}")
+
+        if path.suffix == RAW_SUFFIX:
+            return _read_file(path)
+        return frame_codec.decode_frame(_read_file(path), self._read_persisted_base)
+
+    def _read_persisted_base(self, checksum: str) -> bytes:
+        if self.locate(checksum) is not None:
+            return self.read(checksum)
+
+        with self._lock:
+            pending = checksum in self._pending
+        recent = self._codec.recent(checksum) if self._codec is not None else None
+        if pending and recent is not None:
+            return recent
+        raise RuntimeError(f"Snapshot object missing: {checksum}")
+
+    def _read_base(self, checksum: str) -> bytes:
+        if self._codec is not None:
+            recent = self._codec.recent(checksum)
+            if recent is not None:
+                return recent
+        return self.read(checksum)
+
+    # ---- index ----
+
+    def record_experiment(self, experiment_id: str, frames: Dict[str, str]) -> None:
+        """Append experiment_id → {role: checksum} to the index."""
+        line = json.dumps({
+            "experiment_id": experiment_id,
+            "timestamp": time.time(),
+            "frames": dict(frames),
+        })
+        with self._lock:
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def frames_for(self, experiment_id: str) -> Optional[Dict[str, str]]:
+        for entry in self._iter_index():
+            if entry.get("experiment_id") == experiment_id:
+                return entry.get("frames")
+        return None
+
+    def _iter_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return
+
+    # ---- retention ----
+
+    def gc(self, max_age: float = None, max_bytes: int = None) -> Dict[str, Any]:
+        """
+        Remove objects older than max_age seconds (by last reference), then
+        the oldest remaining objects until the total is within max_bytes.
+        Index entries whose frames are all gone are dropped.
+        """
+        now = time.time()
+
+        objects = []
+        for suffix in _SUFFIXES:
+            for path in self.objects_dir.rglob(f"*{suffix}"):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                objects.append((st.st_mtime, st.st_size, path))
+
+        objects.sort()
+        total = sum(size for _, size, _ in objects)
+
+        # select victims oldest-first against the projected total
+        victims = []
+        projected = total
+        for mtime, size, path in objects:
+            expired = max_age is not None and now - mtime > max_age
+            over = max_bytes is not None and projected > max_bytes
+            if expired or over:
+                victims.append((mtime, size, path))
+                projected -= size
+
+        victim_paths = {path for _, _, path in victims}
+        pinned = self._codec.pinned() if self._codec is not None else set()
+        protected = pinned | self._decode_dependencies(
+            [path for _, _, path in objects if path not in victim_paths or path.stem in pinned]
+        )
+
+        removed = 0
+        freed = 0
+        with self._lock:
+            for mtime, size, path in victims:
+                if path.stem in self._pending or path.stem in protected:
+                    continue
+                try:
+                    # claim() refreshes mtime under this lock: an object
+                    # re-referenced since the scan is no longer a victim
+                    if path.stat().st_mtime > mtime:
+                        continue
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                freed += size
+                total -= size
+
+            if removed:
+                self._compact_index()
+
+        return {
+            "objects_removed": removed,
+            "bytes_freed": freed,
+            "bytes_retained": total,
+        }
+
+    def _decode_dependencies(self, retained) -> set:
+        """Checksums of every base frame reachable from retained codec objects."""
+        needed = set()
+        stack = [p for p in retained if p.suffix == frame_codec.SUFFIX]
+        while stack:
+            path = stack.pop()
+            try:
+                base = frame_codec.read_header_file(path)["base_checksum"]
+            except Exception:
+                continue
+            if base is None or base in needed:
+                continue
+            needed.add(base)
+            base_path = self.locate(base)
+            if base_path is not None:
+                stack.append(base_path)
+        return needed
+
+    def _compact_index(self) -> None:
+        kept = []
+        for entry in self._iter_index():
+            frames = entry.get("frames") or {}
+            if any(self.locate(c) is not None for c in frames.values()):
+                kept.append(json.dumps(entry))
+
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for line in kept:
+                f.write(line + "\n")
+        tmp.replace(self.index_path)
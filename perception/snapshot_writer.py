@@ -0,0 +1,194 @@
+"""
+SNAPSHOT WRITER — BACKGROUND PERSISTENCE
+
+Moves snapshot durability off the capture path.
+
+Guarantees (same as inline persistence):
+- Temp file → fsync → atomic rename, never a partial file at the final path
+- Directory fsync before a frame counts as durable
+- Any failure is sticky and surfaces at the next submit() / flush()
+
+Differences:
+- Frames are queued (bounded) and written by worker thread(s)
+- Each batch shares one directory fsync per directory (group commit)
+- flush() is the durability barrier callers must wait on; flush(upto=seq)
+  waits only for frames submitted up to that sequence number
+"""
+
+import os
+import atexit
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from core import metrics, tracing
+
+
+_STOP = object()
+
+
+def _write_synced_temp(path: Path, data: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(
+        dir=str(path.parent),
+        delete=False,
+    ) as tmp:
+        tmp.write(data)
+        tmp.flush()
+        os.fsync(tmp.fileno())
+        return Path(tmp.name)
+
+
+def _fsync_dir(directory: Path) -> None:
+    dir_fd = os.open(str(directory), os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class SnapshotWriter:
+    """
+    Bounded queue + writer threads with group-commit directory fsync.
+    """
+
+    def __init__(self, max_pending: int = 8, batch_size: int = 4, workers: int = 1):
+        if max_pending < 1 or batch_size < 1 or workers < 1:
+            raise ValueError("max_pending, batch_size and workers must be >= 1")
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._batch_size = batch_size
+
+        self._cond = threading.Condition()
+        self._seq = 0              # sequence number of the last submit()
+        self._outstanding = set()  # sequence numbers not yet durable
+        self._error: Optional[str] = None
+        self._closed = False
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"snapshot-writer-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+        atexit.register(self.close)
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recent submit() (0 before any)."""
+        with self._cond:
+            return self._seq
+
+    def submit(self, path: Path, data: Union[bytes, Callable[[], bytes]], on_durable: Callable[[Path], None] = None) -> int:
+        """
+        Queue one frame. Blocks while the queue is full (backpressure).
+        data may be a zero-argument callable; it is invoked on the writer
+        thread (e.g. deferred encoding).
+        on_durable(path) runs on the writer thread once the frame is durable;
+        an exception raised there is treated as a persistence failure.
+        Returns the frame's sequence number (for flush(upto=...)).
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SnapshotWriter is closed")
+            if self._error is not None:
+                raise RuntimeError(f"Snapshot persistence failure: {self._error}")
+            self._seq += 1
+            seq = self._seq
+            self._outstanding.add(seq)
+
+        self._queue.put((Path(path), data, on_durable, seq))
+        return seq
+
+    def flush(self, timeout: float = None, upto: int = None) -> None:
+        """
+        Barrier: returns once every submitted frame is durable, or with
+        upto, every frame whose sequence number is <= upto (later ones may
+        still be queued). Raises if any write failed or the timeout expires.
+        """
+        def done():
+            return not self._outstanding or (upto is not None and min(self._outstanding) > upto)
+
+        with self._cond:
+            if not self._cond.wait_for(done, timeout=timeout):
+                raise RuntimeError("Snapshot flush timed out")
+            if self._error is not None:
+                raise RuntimeError(f"Snapshot persistence failure: {self._error}")
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for t in self._threads:
+            t.join()
+
+    # ---- worker side ----
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self._batch_size:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            t0 = time.perf_counter()
+            with tracing.span("writer.commit"):
+                self._commit(batch)
+            metrics.PERSIST_SECONDS.observe(time.perf_counter() - t0)
+
+            if stop:
+                return
+
+    def _commit(self, batch) -> None:
+        err = None
+        try:
+            dirs = []
+            for path, data, _, _ in batch:
+                if callable(data):
+                    data = data()
+                metrics.BYTES_WRITTEN.observe(len(data))
+                tmp_path = _write_synced_temp(path, data)
+                tmp_path.replace(path)
+                if path.parent not in dirs:
+                    dirs.append(path.parent)
+
+            # one durability barrier per directory for the whole batch
+            for d in dirs:
+                _fsync_dir(d)
+
+        except Exception as e:
+            err = f"Atomic write failure: {e}"
+
+        if err is None:
+            try:
+                for path, _, on_durable, _ in batch:
+                    if on_durable is not None:
+                        on_durable(path)
+            except Exception as e:
+                err = str(e)
+
+        with self._cond:
+            if err is not None and self._error is None:
+                self._error = err
+            self._outstanding.difference_update(seq for _, _, _, seq in batch)
+            self._cond.notify_all()
@@ -0,0 +1,218 @@
+"""
+Tile hashes.
+
+A frame is cut into fixed-size tiles (edge tiles may be smaller) and each
+tile gets a short content digest. Two frames can then be compared pixel by
+pixel only inside tiles whose digests differ.
+
+No semantics. Pure measurement.
+
+Digest = sum over the tile's pixels (one uint32 word each) times fixed
+random odd 64-bit weights, mod 2^64: one vectorized pass over the frame.
+A digest collision is the only way a change is missed: for a change in
+any colour channel at most 2^-41 per changed tile (alpha-only: 2^-33),
+for typical changes about 2^-64. Not a defence against crafted frames.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from perception.regions import DEFAULT_CELL_SIZE, cells_from_mask
+
+
+DEFAULT_TILE_SIZE = 64
+_WEIGHT_SEED = 0x454D45
+
+_weights = {}
+
+
+class TileMap:
+    """
+    Immutable per-frame tile digests, shape (rows, cols).
+    """
+
+    __slots__ = ("tile_size", "width", "height", "digests")
+
+    def __init__(self, tile_size: int, width: int, height: int, digests: np.ndarray):
+        self.tile_size = int(tile_size)
+        self.width = int(width)
+        self.height = int(height)
+        digests.flags.writeable = False
+        self.digests = digests
+
+    def compatible(self, other: "TileMap") -> bool:
+        return (
+            other is not None
+            and self.tile_size == other.tile_size
+            and self.width == other.width
+            and self.height == other.height
+        )
+
+
+def _tile_weights(height: int, width: int) -> np.ndarray:
+    """Fixed (height, width) odd uint64 weights; same values in every process."""
+    key = (height, width)
+    weights = _weights.get(key)
+    if weights is None:
+        rng = np.random.default_rng([_WEIGHT_SEED, height, width])
+        weights = rng.integers(0, 1 << 63, size=key, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        weights.flags.writeable = False
+        _weights[key] = weights
+    return weights
+
+
+def _words(frame: np.ndarray):
+    """(H, W * unit) array of hash words and unit = words per pixel."""
+    frame = np.ascontiguousarray(frame)
+    if frame.ndim == 3 and frame.shape[2] == 4 and frame.dtype == np.uint8:
+        return frame.view(np.uint32).reshape(frame.shape[:2]), 1
+    raw = frame.view(np.uint8).reshape(frame.shape[0], -1)
+    return raw, raw.shape[1] // frame.shape[1]
+
+
+def compute_tile_map(frame: np.ndarray, tile_size: int = DEFAULT_TILE_SIZE) -> TileMap:
+    if tile_size < 1:
+        raise ValueError("tile_size must be >= 1")
+
+    h, w = frame.shape[:2]
+    rows = -(-h // tile_size)
+    cols = -(-w // tile_size)
+    full_rows, full_cols = h // tile_size, w // tile_size
+
+    words, unit = _words(frame)
+    tw = tile_size * unit
+    digests = np.empty((rows, cols), dtype=np.uint64)
+
+    # full tiles in one einsum; the right and bottom edges (smaller tiles) likewise
+    for r0, r1, th in ((0, full_rows, tile_size), (full_rows, rows, h - full_rows * tile_size)):
+        for c0, c1, cw in ((0, full_cols, tw), (full_cols, cols, w * unit - full_cols * tw)):
+            if r1 == r0 or c1 == c0:
+                continue
+            block = words[r0 * tile_size:r0 * tile_size + (r1 - r0) * th, c0 * tw:c0 * tw + (c1 - c0) * cw]
+            digests[r0:r1, c0:c1] = np.einsum(
+                "aibj,ij->ab",
+                block.reshape(r1 - r0, th, c1 - c0, cw),
+                _tile_weights(th, cw),
+                dtype=np.uint64,
+            )
+
+    return TileMap(tile_size, w, h, digests)
+
+
+def changed_tiles(pre_tiles: TileMap, post_tiles: TileMap) -> np.ndarray:
+    """(n, 2) [ty, tx] of tiles whose digests differ, row-major."""
+    if not pre_tiles.compatible(post_tiles):
+        raise RuntimeError("Tile map mismatch")
+    return np.argwhere(pre_tiles.digests != post_tiles.digests)
+
+
+def tile_delta(pre_arr: np.ndarray, post_arr: np.ndarray, pre_tiles: TileMap, post_tiles: TileMap,
+               cell: int = DEFAULT_CELL_SIZE, changed: np.ndarray = None) -> Dict[str, Any]:
+    """
+    Exact pixel counts inside changed tiles only.
+    Returns pixels_changed, bbox (inclusive, frame coordinates), tiles_changed ([tx, ty])
+    and cells on the fixed `cell` grid (row-major, as cells_from_mask over the
+    whole frame would give), so regions do not depend on the tile size.
+    changed: changed_tiles() result, if already known.
+
+    The cells overlapping changed tiles are gathered and compared in one
+    pass; only cells on a partial right / bottom edge are compared one by one.
+    """
+    if changed is None:
+        changed = changed_tiles(pre_tiles, post_tiles)
+
+    h, w = pre_arr.shape[:2]
+    cy, cx = np.nonzero(_candidate_cells(changed, pre_tiles, cell))
+    full_rows, full_cols = h // cell, w // cell
+    inner = (cy < full_rows) & (cx < full_cols)
+
+    pre_words, unit = _words(pre_arr)
+    post_words, _ = _words(post_arr)
+    cells = []
+
+    if inner.any():
+        iy, ix = cy[inner], cx[inner]
+        shape = (full_rows, cell, full_cols, cell * unit)
+        a = pre_words[:full_rows * cell, :full_cols * cell * unit].reshape(shape)[iy, :, ix]
+        b = post_words[:full_rows * cell, :full_cols * cell * unit].reshape(shape)[iy, :, ix]
+        # (n, cell, cell) masks stacked into one strip: strip cell i is candidate i
+        strip = _word_mask(a, b, unit).reshape(-1, cell)
+        for i, _, n, (x0, y0, x1, y1) in cells_from_mask(strip, cell):
+            by, bx = int(iy[i]) * cell, int(ix[i]) * cell
+            y0 -= i * cell
+            y1 -= i * cell
+            cells.append((int(iy[i]), int(ix[i]), n, [bx + x0, by + y0, bx + x1, by + y1]))
+
+    for ey, ex in zip(cy[~inner], cx[~inner]):
+        by, bx = int(ey) * cell, int(ex) * cell
+        mask = _word_mask(
+            pre_words[by:by + cell, bx * unit:(bx + cell) * unit],
+            post_words[by:by + cell, bx * unit:(bx + cell) * unit],
+            unit,
+        )
+        for _, _, n, (x0, y0, x1, y1) in cells_from_mask(mask, cell):
+            cells.append((int(ey), int(ex), n, [bx + x0, by + y0, bx + x1, by + y1]))
+
+    cells.sort(key=lambda c: (c[0], c[1]))
+    pixels_changed = sum(c[2] for c in cells)
+    bbox = None
+    if cells:
+        boxes = np.array([c[3] for c in cells])
+        bbox = [int(boxes[:, 0].min()), int(boxes[:, 1].min()), int(boxes[:, 2].max()), int(boxes[:, 3].max())]
+
+    return {
+        "pixels_changed": pixels_changed,
+        "bbox": bbox,
+        "tiles_changed": changed[:, ::-1].tolist(),
+        "cells": cells,
+    }
+
+
+def _candidate_cells(changed: np.ndarray, tiles: TileMap, cell: int) -> np.ndarray:
+    """(rows, cols) bool over the `cell` grid: cells overlapping a changed tile."""
+    size = tiles.tile_size
+    grid = np.zeros(tiles.digests.shape, dtype=bool)
+    grid[changed[:, 0], changed[:, 1]] = True
+
+    for axis, extent in ((0, tiles.height), (1, tiles.width)):
+        # cell k spans pixels [k * cell, min(extent, (k + 1) * cell) - 1]
+        starts = np.arange(0, extent, cell)
+        ends = np.minimum(starts + cell, extent) - 1
+        # any changed tile in [starts // size, ends // size], via prefix counts
+        counts = np.cumsum(grid, axis=axis)
+        counts = np.insert(counts, 0, 0, axis=axis)
+        grid = (np.take(counts, ends // size + 1, axis=axis) - np.take(counts, starts // size, axis=axis)) > 0
+    return grid
+
+
+def _word_mask(a: np.ndarray, b: np.ndarray, unit: int) -> np.ndarray:
+    """Pixel change mask from hash words (`unit` words per pixel, last axis)."""
+    mask = a != b
+    if unit > 1:
+        mask = mask.reshape(mask.shape[:-1] + (-1, unit)).any(axis=-1)
+    return mask
+
+
+class TileMapCache:
+    """
+    Small LRU of tile maps keyed by frame checksum, so a post frame that
+    becomes the next pre frame is only hashed once.
+    """
+
+    def __init__(self, capacity: int = 8):
+        self._capacity = capacity
+        self._items = OrderedDict()
+
+    def get(self, key) -> Optional[TileMap]:
+        tm = self._items.get(key)
+        if tm is not None:
+            self._items.move_to_end(key)
+        return tm
+
+    def put(self, key, tile_map: TileMap) -> None:
+        self._items[key] = tile_map
+        self._items.move_to_end(key)
+        while len(self._items) > self._capacity:
+            self._items.popitem(last=False)
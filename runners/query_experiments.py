@@ -0,0 +1,80 @@
+"""
+Query the indexed experiment store.
+
+  python -m runners.query_experiments ingest [logs/experiments.jsonl]
+  python -m runners.query_experiments list --action-id X --since 7d --limit 20
+  python -m runners.query_experiments stats --action-id X --since 7d
+
+Records are streamed as JSON lines; stats are printed as one JSON object.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+from core.logger import EXPERIMENT_LOG
+from core.experiment_store import ExperimentStore, EXPERIMENT_DB
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def _parse_time(value: str) -> float:
+    """Epoch seconds, or a relative age like 90m / 24h / 7d."""
+    if value and value[-1] in _UNITS:
+        return time.time() - float(value[:-1]) * _UNITS[value[-1]]
+    return float(value)
+
+
+def _filters(args):
+    filters = {
+        "action_id": args.action_id,
+        "reason": args.reason,
+        "since": _parse_time(args.since) if args.since else None,
+        "until": _parse_time(args.until) if args.until else None,
+    }
+    if args.attributed is not None:
+        filters["attributed"] = args.attributed == "yes"
+    return filters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=EXPERIMENT_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="load JSONL records into the store")
+    ingest.add_argument("paths", nargs="*", type=Path, default=[EXPERIMENT_LOG])
+
+    for name in ("list", "stats"):
+        p = sub.add_parser(name)
+        p.add_argument("--action-id")
+        p.add_argument("--reason")
+        p.add_argument("--since", help="epoch seconds or age (e.g. 7d)")
+        p.add_argument("--until", help="epoch seconds or age (e.g. 1h)")
+        p.add_argument("--attributed", choices=("yes", "no"))
+        if name == "list":
+            p.add_argument("--limit", type=int)
+
+    args = parser.parse_args(argv)
+    store = ExperimentStore(args.db)
+
+    try:
+        if args.command == "ingest":
+            for path in args.paths:
+                inserted = store.ingest_jsonl(path)
+                print(json.dumps({"path": str(path), "inserted": inserted}))
+
+        elif args.command == "list":
+            for record in store.query(limit=args.limit, **_filters(args)):
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        elif args.command == "stats":
+            print(json.dumps(store.stats(**_filters(args)), indent=2))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Replay: rebuild the delta (and causality) of logged experiments from
+their persisted snapshots.
+
+  python -m runners.replay logs/experiments.jsonl logs/experiments.replayed.jsonl --workers 8
+
+Rules:
+- Source log is only read; results go to a new derived log, in source order
+- Both frames are re-hashed with the recorded algorithm before measuring;
+  a missing or mismatching frame keeps the original delta and is marked
+  with replay.error
+- Work units are chunks of JSON lines; frames are read inside the
+  workers (memory-mapped), never pickled
+- Resumable: experiment_ids already in the derived log are skipped
+- Per-monitor records: every monitor's delta is rebuilt, then the
+  combined top-level delta from those
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from core.delta import Delta
+from evaluation.causality import evaluate_causality
+from execution.life_loop import _combine_deltas, _compute_delta, _load_raw_frame
+from perception.screen_adapter import HASH_ALGORITHMS, ScreenSnapshot
+
+
+def _snapshot(info: dict, root: Path) -> ScreenSnapshot:
+    path = Path(info["path"])
+    if not path.is_absolute():
+        path = root / path
+
+    algorithm = info.get("hash_algorithm") or "sha256"
+    if algorithm not in HASH_ALGORITHMS:
+        raise RuntimeError(f"Unknown hash algorithm: {algorithm}")
+
+    frame = _load_raw_frame(path, info["width"], info["height"])
+    if HASH_ALGORITHMS[algorithm](frame) != info["checksum"]:
+        raise RuntimeError(f"Checksum mismatch: {path}")
+
+    return ScreenSnapshot(
+        path=info["path"],
+        tmono=info["timestamp"],
+        twall=info.get("timestamp_wall") or 0.0,
+        width=info["width"],
+        height=info["height"],
+        checksum=info["checksum"],
+        frame=frame,
+        region=info.get("region"),
+        hash_algorithm=algorithm,
+    )
+
+
+def replay_record(record: dict, root: Path) -> dict:
+    """Derived record: fresh delta + causality, or the original marked with replay.error."""
+    out = dict(record)
+    try:
+        if record.get("monitors"):
+            monitors = []
+            for m in record["monitors"]:
+                pre = _snapshot(m["pre_snapshot"], root)
+                post = _snapshot(m["post_snapshot"], root)
+                monitors.append({**m, "delta": Delta(_compute_delta(pre, post)).to_dict()})
+            delta = Delta(_combine_deltas([m["delta"] for m in monitors])).to_dict()
+            pre_ts = record["pre_snapshot"]["timestamp"]
+            post_ts = record["post_snapshot"]["timestamp"]
+            out["monitors"] = monitors
+        else:
+            pre = _snapshot(record["pre_snapshot"], root)
+            post = _snapshot(record["post_snapshot"], root)
+            delta = Delta(_compute_delta(pre, post)).to_dict()
+            pre_ts, post_ts = pre.timestamp_monotonic, post.timestamp_monotonic
+
+        out["delta"] = delta
+        out["causality"] = evaluate_causality(
+            delta=delta,
+            time_window=(record["start_timestamp"], record["end_timestamp"]),
+            pre_ts=pre_ts,
+            post_ts=post_ts,
+        )
+        out["replay"] = {"error": None, "replayed_at": time.time()}
+    except Exception as e:
+        out["replay"] = {"error": str(e), "replayed_at": time.time()}
+    return out
+
+
+def _replay_chunk(lines, root: str):
+    """Worker: JSON lines in → (derived JSON lines, failures) out."""
+    root = Path(root)
+    out, failed = [], 0
+    for line in lines:
+        derived = replay_record(json.loads(line), root)
+        if derived["replay"]["error"] is not None:
+            failed += 1
+        out.append(json.dumps(derived, ensure_ascii=False))
+    return out, failed
+
+
+def _done_ids(path: Path) -> set:
+    """experiment_ids already derived; drops a torn last line first."""
+    if not path.exists():
+        return set()
+
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+    done = set()
+    for line in data[:end].splitlines():
+        try:
+            done.add(json.loads(line)["experiment_id"])
+        except Exception:
+            pass
+    return done
+
+
+def _pending_lines(source: Path, done: set, skipped: list):
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if done:
+                try:
+                    if json.loads(line).get("experiment_id") in done:
+                        skipped[0] += 1
+                        continue
+                except ValueError:
+                    pass
+            yield line
+
+
+def replay(source: Path, target: Path, workers: int = None, chunk_size: int = 64,
+           root: Path = None, progress_every: float = 5.0):
+    workers = workers or os.cpu_count() or 1
+    root = Path(root) if root is not None else Path.cwd()
+
+    done = _done_ids(target)
+    skipped = [0]
+    lines = _pending_lines(source, done, skipped)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    written = failed = 0
+    t0 = last = time.perf_counter()
+
+    def report(final=False):
+        elapsed = time.perf_counter() - t0
+        rate = written / elapsed if elapsed > 0 else 0.0
+        print(
+            f"replay: {written} written, {failed} failed, {skipped[0]} skipped, {rate:.1f}/s"
+            + (" (done)" if final else ""),
+            file=sys.stderr,
+        )
+
+    with open(target, "a", encoding="utf-8") as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+
+        def drain_one():
+            nonlocal written, failed, last
+            derived, n_failed = in_flight.popleft().result()
+            out.write("".join(d + "\n" for d in derived))
+            out.flush()
+            written += len(derived)
+            failed += n_failed
+            if time.perf_counter() - last >= progress_every:
+                last = time.perf_counter()
+                report()
+
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                break
+            in_flight.append(pool.submit(_replay_chunk, chunk, str(root)))
+            # bounded read-ahead; results are written in submission order
+            while len(in_flight) >= 2 * workers:
+                drain_one()
+
+        while in_flight:
+            drain_one()
+
+    report(final=True)
+    return {"written": written, "failed": failed, "skipped": skipped[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute deltas of logged experiments from stored snapshots.")
+    parser.add_argument("source", type=Path)
+    parser.add_argument("target", type=Path)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--root", type=Path, default=None, help="base for relative snapshot paths (default: cwd)")
+    args = parser.parse_args(argv)
+
+    if args.source.resolve() == args.target.resolve():
+        parser.error("target must differ from source")
+
+    print(json.dumps(replay(args.source, args.target, args.workers, args.chunk_size, args.root)))
+
+
+if __name__ == "__main__":
+    main()
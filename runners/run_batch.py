@@ -1,12 +1,70 @@
+import json
 import time
-from runners.run_once import run
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from execution.life_loop import LifeLoop
+from execution.action_executor import ActionExecutor
+from core.logger import Logger
+from perception.screen_adapter import ScreenAdapter
+from perception.snapshot_writer import SnapshotWriter
+from actions.move_mouse import MoveMouse
+
+
+def run_pipelined(actions, loop: LifeLoop = None, delay: float = 0.0, max_in_flight: int = 2):
+    """
+    One LifeLoop (one capture session) for the whole batch.
+
+    Observation of experiment N+1 (pre-capture, action, post-capture)
+    overlaps with the conclusion of experiment N (persistence barrier,
+    delta, causality, log) on a single worker, so records stay in order.
+    Any failure propagates and stops the batch.
+
+    The default loop persists through a SnapshotWriter, so writing and
+    verifying frames also leaves observe(); it is closed when the batch ends.
+    """
+    writer = None
+    try:
+        if loop is None:
+            writer = SnapshotWriter()
+            loop = LifeLoop(ActionExecutor(), Logger(), screen=ScreenAdapter(writer=writer))
+        return _run(actions, loop, delay, max_in_flight)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _run(actions, loop, delay, max_in_flight):
+    in_flight = deque()
+    count = 0
+    t0 = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="conclude") as worker:
+        for action in actions:
+            obs = loop.observe(action)
+            in_flight.append(worker.submit(loop.conclude, obs))
+            count += 1
+
+            while len(in_flight) >= max_in_flight:
+                in_flight.popleft().result()
+
+            if delay:
+                time.sleep(delay)
+
+        while in_flight:
+            in_flight.popleft().result()
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "experiments": count,
+        "seconds": elapsed,
+        "experiments_per_second": count / elapsed if elapsed > 0 else None,
+    }
 
 
 def run_batch(n=300, delay=0.1):
-    for _ in range(n):
-        run()
-        time.sleep(delay)
+    return run_pipelined((MoveMouse() for _ in range(n)), delay=delay)
 
 
 if __name__ == "__main__":
-    run_batch()
+    print(json.dumps(run_batch()))
@@ -1,11 +1,40 @@
+import os
 import time
+from pathlib import Path
+
 from execution.life_loop import LifeLoop
 from execution.action_executor import ActionExecutor
 from core.logger import Logger
+from core.experiment_store import ExperimentStore
+from core.metrics import TextfileExporter
+from core.tracing import configure_tracing
+from perception.delta_cache import DeltaCache
+from perception.screen_adapter import ScreenAdapter
+from perception.snapshot_store import SnapshotStore
 from actions.probe_action import ProbeAction
 
-loop = LifeLoop(ActionExecutor(), Logger())
+RETENTION_BYTES = 10 * 1024 ** 3
+GC_EVERY = 1000
+
+# EME_TRACE=<file>: per-phase timings in each record + Chrome trace events
+if os.environ.get("EME_TRACE"):
+    configure_tracing(trace_path=Path(os.environ["EME_TRACE"]))
+
+# EME_METRICS=<file>.prom: Prometheus textfile, rewritten every 15 s
+if os.environ.get("EME_METRICS"):
+    TextfileExporter(Path(os.environ["EME_METRICS"]))
+
+# EME_PER_MONITOR=1: each physical monitor captured and measured as its own frame
+PER_MONITOR = os.environ.get("EME_PER_MONITOR") == "1"
+
+store = SnapshotStore()
+# experiments.jsonl stays the record; logs/experiments.sqlite indexes it as it grows
+logger = Logger(tee=[ExperimentStore()])
+loop = LifeLoop(ActionExecutor(), logger, screen=ScreenAdapter(store=store), delta_cache=DeltaCache(),
+                per_monitor=PER_MONITOR)
 
-for _ in range(10000):
+for i in range(10000):
     loop.run_experiment(ProbeAction())
+    if (i + 1) % GC_EVERY == 0:
+        store.gc(max_bytes=RETENTION_BYTES)
     time.sleep(0.2)
@@ -0,0 +1,78 @@
+"""
+High-rate headless experiments against the in-memory VirtualBackend.
+
+  python -m runners.run_virtual --experiments 100000 --seed 0
+
+Deterministic for a given seed. Frames go to a content-addressed store
+(XOR-residual codec), records to logs/virtual_experiments.jsonl.
+"""
+
+import json
+import random
+import argparse
+from pathlib import Path
+
+from actions.backend_actions import Click, KeyPress, PointerMove
+from body.virtual_backend import VirtualBackend
+from core.logger import LOG_DIR, Logger, configure_event_log
+from execution.action_executor import ActionExecutor
+from execution.life_loop import LifeLoop
+from perception.frame_codec import FrameCodec
+from perception.screen_adapter import HASH_ALGORITHMS, ScreenAdapter
+from perception.snapshot_store import SnapshotStore
+from perception.snapshot_writer import SnapshotWriter
+from runners.run_batch import run_pipelined
+
+KEYS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def virtual_actions(backend: VirtualBackend, n: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.6:
+            yield PointerMove(backend, rng.randrange(backend.width), rng.randrange(backend.height))
+        elif kind < 0.8:
+            yield Click(backend)
+        else:
+            yield KeyPress(backend, rng.choice(KEYS))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run experiments against the virtual backend.")
+    parser.add_argument("--experiments", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--store", type=Path, default=Path("snapshots") / "virtual")
+    parser.add_argument("--log", type=Path, default=LOG_DIR / "virtual_experiments.jsonl")
+    parser.add_argument("--hash", choices=tuple(HASH_ALGORITHMS), default="sha256",
+                        help="snapshot content hash (default sha256; see the benchmark's hash_* stages)")
+    args = parser.parse_args(argv)
+
+    # several events per experiment: one open/append/close each is too slow here
+    configure_event_log(buffered=True)
+
+    backend = VirtualBackend(args.width, args.height)
+    writer = SnapshotWriter()
+    screen = ScreenAdapter(
+        writer=writer,
+        store=SnapshotStore(args.store, codec=FrameCodec()),
+        hash_algorithm=args.hash,
+        verify="sampled",
+        backend=backend,
+    )
+    logger = Logger(args.log, buffered=True)
+    loop = LifeLoop(ActionExecutor(), logger, screen=screen)
+
+    try:
+        stats = run_pipelined(virtual_actions(backend, args.experiments, args.seed), loop=loop)
+    finally:
+        logger.close()
+        writer.close()
+
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()